@@ -0,0 +1,40 @@
+"""
+Times sign_language.load_data with a cold and a warm decode cache.
+
+Run from the project folder:  python -m datasets.benchmark_sign_language
+"""
+import shutil
+import tempfile
+import time
+from datasets import sign_language
+
+
+def time_load(repeat=3, **kwargs):
+    # Best of `repeat` calls, in seconds
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sign_language.load_data(**kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(size=2000):
+    cache_dir = tempfile.mkdtemp()
+    try:
+        serial = time_load(repeat=1, size=size, n_jobs=1)
+        start = time.perf_counter()
+        sign_language.load_data(size=size, cache_dir=cache_dir)
+        cold = time.perf_counter() - start
+        warm = time_load(size=size, cache_dir=cache_dir)
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print('load_data(size={})'.format(size))
+    print('\tserial, no cache:   {:8.3f} s'.format(serial))
+    print('\tparallel, cold:     {:8.3f} s'.format(cold))
+    print('\tparallel, warm:     {:8.3f} s'.format(warm))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+import numpy as np
+from PIL import Image
+
+
+def decode_image(args):
+    """
+    Worker for `sign_language.decode_paths`: the pixels of one image file,
+    resized to (size, size) like `keras.preprocessing.image.load_img`.
+
+    Kept out of `sign_language` so that worker processes started with spawn
+    (the default on macOS and Windows) import only Pillow and NumPy, not
+    Keras.  Pixels are whole numbers, so uint8 keeps the inter-process
+    transfer four times smaller than float32.
+    """
+    img_path, size = args
+    with Image.open(img_path) as img:
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.NEAREST)
+        return np.asarray(img, dtype=np.uint8)
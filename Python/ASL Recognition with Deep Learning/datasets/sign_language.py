@@ -1,17 +1,61 @@
 import random
+import hashlib
+import inspect
 import numpy as np
-from keras.utils import np_utils, to_categorical
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from keras.utils import to_categorical, Sequence
 from keras.preprocessing import image
-from os import listdir
-from os.path import isdir, join
+from os import listdir, makedirs, replace, cpu_count
+from os.path import isdir, join, getmtime, exists
+from numpy.lib.format import open_memmap
+from datasets.image_decoding import decode_image
+
+# Keras 3 sequences take their prefetching options themselves; Keras 2 takes
+# them as arguments to fit
+_SEQUENCE_PREFETCH = ('workers' in
+                      inspect.signature(Sequence.__init__).parameters)
 
 
 def load_data(container_path='datasets', folders=['A', 'B', 'C'],
-              size=2000, test_split=0.2, seed=0):
+              size=2000, test_split=0.2, seed=0, n_jobs=None,
+              cache_dir=None, mmap=False):
     """
     Loads sign language dataset.
+
+    Images are decoded by `n_jobs` worker processes (all cores when None,
+    serially when 1).  When `cache_dir` is given, the decoded pixels are
+    saved there and reused on the next call with the same files.
+
+    With `mmap=True` (which needs a `cache_dir`) the images are returned
+    as read-only uint8 views of the memory-mapped cache file instead of
+    normalized float32 arrays.  Wrap them in an `ArraySequence` to train
+    on batches that are normalized as they are read.
     """
 
+    filenames, labels = _shuffled_files(container_path, folders, size, seed)
+
+    # Get the images
+    if mmap:
+        x = paths_to_pixels(filenames, n_jobs=n_jobs, cache_dir=cache_dir,
+                            mmap_mode='r')
+    else:
+        x = paths_to_tensor(filenames, n_jobs=n_jobs, cache_dir=cache_dir)
+        x /= 255
+    # Store the one-hot targets
+    y = np.array(labels)
+
+    # Slices of `x` are views, so the split does not copy the images again
+    split = int(len(x) * (1 - test_split))
+    x_train, y_train = x[:split], y[:split]
+    x_test, y_test = x[split:], y[split:]
+
+    return (x_train, y_train), (x_test, y_test)
+
+
+def _shuffled_files(container_path, folders, size, seed):
+    # Same seed, same order: load_data and stream_data split identically
     filenames, labels = [], []
 
     for label, folder in enumerate(folders):
@@ -26,18 +70,151 @@ def load_data(container_path='datasets', folders=['A', 'B', 'C'],
     random.shuffle(data)
     data = data[:size]
     filenames, labels = zip(*data)
+    return list(filenames), np.array(labels)
 
-    # Get the images
-    x = paths_to_tensor(filenames).astype('float32')/255
-    # Store the one-hot targets
-    y = np.array(labels)
 
-    x_train = np.array(x[:int(len(x) * (1 - test_split))])
-    y_train = np.array(y[:int(len(x) * (1 - test_split))])
-    x_test = np.array(x[int(len(x) * (1 - test_split)):])
-    y_test = np.array(y[int(len(x) * (1 - test_split)):])
+def stream_data(container_path='datasets', folders=['A', 'B', 'C'],
+                size=None, test_split=0.2, seed=0, batch_size=32,
+                img_size=50, prefetch=2, workers=2):
+    """
+    Streams the sign language dataset from disk in batches.
 
-    return (x_train, y_train), (x_test, y_test)
+    Returns a training and a test `SignLanguageSequence` holding the same
+    images as `load_data` with the same arguments, but only a few batches
+    are ever decoded at a time.  By default every image is used.
+    """
+    filenames, labels = _shuffled_files(container_path, folders, size, seed)
+    split = int(len(filenames) * (1 - test_split))
+    kwargs = dict(num_classes=len(folders), batch_size=batch_size,
+                  img_size=img_size, prefetch=prefetch, workers=workers)
+    train = SignLanguageSequence(filenames[:split], labels[:split],
+                                 shuffle=True, seed=seed, **kwargs)
+    test = SignLanguageSequence(filenames[split:], labels[split:],
+                                shuffle=False, **kwargs)
+    return train, test
+
+
+class SignLanguageSequence(Sequence):
+    """
+    Batches of `(x, y_one_hot)` decoded on demand from image files.
+
+    Can be passed straight to `model.fit`.  The training order is
+    reshuffled after every epoch from `seed`, so runs are reproducible.
+
+    `fit` decodes up to `prefetch` batches ahead in `workers` threads:
+    Keras 3 reads these settings from the sequence, and Keras 2 needs
+    `model.fit(seq, **seq.fit_kwargs)`.  Iterating over the sequence by
+    hand also decodes `prefetch` batches ahead in a background thread.
+    """
+
+    def __init__(self, filenames, labels, num_classes, batch_size=32,
+                 img_size=50, shuffle=True, seed=0, prefetch=2, workers=2):
+        if _SEQUENCE_PREFETCH:
+            super().__init__(workers=workers, use_multiprocessing=False,
+                             max_queue_size=max(1, prefetch))
+            self.fit_kwargs = {}
+        else:
+            super().__init__()
+            self.fit_kwargs = {'workers': workers,
+                               'use_multiprocessing': False,
+                               'max_queue_size': max(1, prefetch)}
+        self.filenames = np.array(filenames)
+        self.labels = np.asarray(labels)
+        self.num_classes = num_classes
+        self.batch_size = batch_size
+        self.img_size = img_size
+        self.shuffle = shuffle
+        self.prefetch = prefetch
+        self.order = np.arange(len(self.filenames))
+        self.epoch = 0
+        self.seed = seed
+        self.on_epoch_end()
+
+    def __len__(self):
+        return int(np.ceil(len(self.filenames) / self.batch_size))
+
+    def __getitem__(self, index):
+        idx = self.order[index * self.batch_size:
+                         (index + 1) * self.batch_size]
+        x = self._pixels(idx).astype(np.float32)
+        x /= 255
+        y = to_categorical(self.labels[idx], self.num_classes)
+        return x, y
+
+    def _pixels(self, idx):
+        return decode_paths(self.filenames[idx], self.img_size, n_jobs=1)
+
+    def __iter__(self):
+        batches = Queue(maxsize=max(1, self.prefetch))
+        # Set when the consumer stops early, so the producer does not block
+        # on a full queue and hold its decoded batches forever
+        stop = Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for index in range(len(self)):
+                    if not put(self[index]):
+                        return
+            except Exception as error:
+                put(error)
+                return
+            put(None)
+
+        Thread(target=produce, daemon=True).start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            stop.set()
+            # Drop whatever was decoded ahead
+            while True:
+                try:
+                    batches.get_nowait()
+                except Empty:
+                    break
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            rng = np.random.RandomState(self.seed + self.epoch)
+            self.order = rng.permutation(len(self.filenames))
+        self.epoch += 1
+
+
+class ArraySequence(SignLanguageSequence):
+    """
+    Batches of `(x, y_one_hot)` taken from uint8 images already in memory
+    or memory-mapped, such as the arrays `load_data(mmap=True)` returns.
+    Only the current batch is converted to float32 and normalized.
+    """
+
+    def __init__(self, x, labels, num_classes, batch_size=32, shuffle=True,
+                 seed=0, prefetch=2, workers=2):
+        self.x = x
+        super().__init__(np.arange(len(x)), labels, num_classes,
+                         batch_size=batch_size, img_size=x.shape[1],
+                         shuffle=shuffle, seed=seed, prefetch=prefetch,
+                         workers=workers)
+
+    def _pixels(self, idx):
+        # Sorted indices read the memory-mapped file front to back
+        order = np.argsort(idx)
+        pixels = np.empty((len(idx),) + self.x.shape[1:], dtype=self.x.dtype)
+        pixels[order] = self.x[idx[order]]
+        return pixels
 
 
 def path_to_tensor(img_path, size):
@@ -49,10 +226,70 @@ def path_to_tensor(img_path, size):
     return np.expand_dims(x, axis=0)
 
 
-def paths_to_tensor(img_paths, size=50):
-    list_of_tensors = [path_to_tensor(img_path, size)
-                       for img_path in img_paths]
-    return np.vstack(list_of_tensors)
+def _cache_path(cache_dir, img_paths, size):
+    # The key changes whenever a file is added, reordered or modified
+    key = hashlib.sha1(str(size).encode())
+    for img_path in img_paths:
+        key.update('{}:{}\n'.format(img_path, getmtime(img_path)).encode())
+    return join(cache_dir, 'sign_language_{}.npy'.format(key.hexdigest()))
+
+
+def decode_paths(img_paths, size=50, n_jobs=None, out=None):
+    """
+    Decodes `img_paths` into a uint8 array of shape (N, size, size, 3).
+
+    Each image is written into its row of `out` (allocated when None) as
+    soon as it is decoded, so no intermediate list of tensors is kept.
+    Worker processes run `image_decoding.decode_image`, which does not
+    import Keras.
+    """
+    if out is None:
+        out = np.empty((len(img_paths), size, size, 3), dtype=np.uint8)
+    jobs = [(img_path, size) for img_path in img_paths]
+    if n_jobs == 1:
+        for i, job in enumerate(jobs):
+            out[i] = decode_image(job)
+        return out
+    n_jobs = n_jobs or cpu_count()
+    chunksize = max(1, len(jobs) // (4 * n_jobs))
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for i, img in enumerate(executor.map(decode_image, jobs,
+                                             chunksize=chunksize)):
+            out[i] = img
+    return out
+
+
+def paths_to_pixels(img_paths, size=50, n_jobs=None, cache_dir=None,
+                    mmap_mode=None):
+    """
+    Returns the uint8 pixels of `img_paths`, decoded or read from the cache.
+
+    A missing cache entry is decoded straight into its memory-mapped file,
+    so the images are never held in memory twice.  With a `mmap_mode` such
+    as 'r' the cached array is memory-mapped rather than read into memory.
+    """
+    img_paths = list(img_paths)
+    if cache_dir is None:
+        if mmap_mode is not None:
+            raise ValueError('mmap_mode requires a cache_dir')
+        return decode_paths(img_paths, size, n_jobs)
+    path = _cache_path(cache_dir, img_paths, size)
+    if not exists(path):
+        makedirs(cache_dir, exist_ok=True)
+        # Write under a temporary name so an interrupted run never
+        # leaves a truncated cache file behind
+        out = open_memmap(path + '.tmp.npy', mode='w+', dtype=np.uint8,
+                          shape=(len(img_paths), size, size, 3))
+        decode_paths(img_paths, size, n_jobs, out=out)
+        out.flush()
+        del out
+        replace(path + '.tmp.npy', path)
+    return np.load(path, mmap_mode=mmap_mode)
+
+
+def paths_to_tensor(img_paths, size=50, n_jobs=None, cache_dir=None):
+    pixels = paths_to_pixels(img_paths, size, n_jobs, cache_dir)
+    return pixels.astype(np.float32)
 
 
 """
@@ -194,6 +194,13 @@ get_ipython().run_cell_magic('nose', '',
 hist = model.fit(x_train, y_train_OH, validation_split=0.2,
                  batch_size=32, epochs=2)
 
+# For datasets larger than memory, stream the same split from disk instead
+# (fit_kwargs turns on background prefetching under Keras 2 and is empty
+# under Keras 3, where the sequences carry those settings themselves)
+# train_seq, test_seq = sign_language.stream_data(size=2000, batch_size=32)
+# hist = model.fit(train_seq, validation_data=test_seq, epochs=2,
+#                  **train_seq.fit_kwargs)
+
 
 # In[15]:
 
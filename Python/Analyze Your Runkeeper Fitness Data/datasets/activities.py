@@ -0,0 +1,116 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+ACTIVITY_COLUMNS = ['Date', 'Type', 'Distance (km)', 'Duration',
+                    'Average Pace', 'Average Speed (km/h)', 'Climb (m)',
+                    'Average Heart Rate (bpm)']
+HEART_RATE = 'Average Heart Rate (bpm)'
+# The notebook fills walks with a fixed 110 bpm instead of their mean
+HEART_RATE_FALLBACKS = {'Walking': 110}
+# Part of the cache key, so caches written in an older row order are
+# never read back
+_CACHE_LAYOUT = 'by-date'
+
+
+def read_activities(path='datasets/cardioActivities.csv'):
+    """
+    Parses a Runkeeper export into the notebook's preprocessed activities.
+
+    Only the columns the notebook keeps are read, `Type` is categorical with
+    'Other' renamed to 'Unicycling', and rows are sorted by date into an
+    increasing DatetimeIndex.  Dates run oldest first, unlike the export:
+    recent pandas only slices increasing indexes by partial dates, so the
+    notebook's `['2018':'2013']` becomes `['2013':'2018']`, both on this
+    frame and on the per-type frames of `activity_views`.
+    """
+    activities = pd.read_csv(path, usecols=ACTIVITY_COLUMNS,
+                             parse_dates=['Date'], dtype={'Type': 'category'})
+    activities['Type'] = activities['Type'].cat.rename_categories(
+        lambda name: 'Unicycling' if name == 'Other' else name)
+    activities = activities.sort_values('Date', kind='stable')
+    return activities.set_index('Date')
+
+
+def _cache_path(cache_dir, path):
+    # The key changes whenever the export is replaced or modified
+    stat = os.stat(path)
+    key = hashlib.sha1('{}:{}:{}:{}'.format(
+        os.path.abspath(path), stat.st_mtime, stat.st_size,
+        _CACHE_LAYOUT).encode())
+    return os.path.join(cache_dir,
+                        'activities_{}.parquet'.format(key.hexdigest()))
+
+
+def load_activities(path='datasets/cardioActivities.csv', cache_dir=None):
+    """
+    `read_activities`, cached as Parquet in `cache_dir` when given.
+
+    The first call parses the CSV and writes the typed columns; later calls
+    for the same, unmodified export read them back without parsing text.
+    """
+    if cache_dir is None:
+        return read_activities(path)
+    cache_path = _cache_path(cache_dir, path)
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path)
+    activities = read_activities(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Rename into place so an interrupted run never leaves half a cache
+    activities.to_parquet(cache_path + '.tmp')
+    os.replace(cache_path + '.tmp', cache_path)
+    return activities
+
+
+def activity_views(activities):
+    """
+    Maps each activity type to its rows of `activities` as returned by
+    `load_activities`, still in date order.
+
+    The rows of every type come from one grouping pass over `Type` instead
+    of a boolean scan and `.copy()` per type.
+    """
+    grouped = activities.groupby('Type', observed=True, sort=True)
+    return {name: activities.iloc[positions]
+            for name, positions in grouped.indices.items()}
+
+
+def impute_heart_rate(activities, fallbacks=None):
+    """
+    Fills missing heart rates of every activity type in one grouped pass.
+
+    Each type's gaps get its mean heart rate truncated to whole beats, as
+    the notebook's `int(avg_hr_run)` does, or the value given for the type
+    in `fallbacks` (HEART_RATE_FALLBACKS when None).  Types with no heart
+    rates and no fallback keep their gaps.  Returns a new frame.
+    """
+    if fallbacks is None:
+        fallbacks = HEART_RATE_FALLBACKS
+    heart_rate = activities[HEART_RATE]
+    fill = np.trunc(heart_rate.groupby(activities['Type'], observed=True)
+                    .transform('mean'))
+    fixed = activities['Type'].map(fallbacks).astype(float)
+    fill = fixed.fillna(fill)
+    return activities.assign(**{HEART_RATE: heart_rate.fillna(fill)})
+
+
+def type_summary(activities, types=('Running', 'Walking', 'Cycling'),
+                 total_cols=('Distance (km)', 'Climb (m)'),
+                 speed_cols=('Average Speed (km/h)',)):
+    """
+    The notebook's detailed summary report for `types`, computed on the
+    unified frame instead of re-concatenating one frame per type.
+
+    Returns `describe()` of the distance, climb and speed of each type with
+    a 'total' added for distance and climb; `.stack()` it for the notebook's
+    layout.
+    """
+    total_cols, speed_cols = list(total_cols), list(speed_cols)
+    selected = activities[activities['Type'].isin(types)]
+    grouped = selected.groupby('Type', observed=True)
+    summary = grouped[total_cols + speed_cols].describe()
+    totals = grouped[total_cols].sum()
+    for column in total_cols:
+        summary[column, 'total'] = totals[column]
+    return summary
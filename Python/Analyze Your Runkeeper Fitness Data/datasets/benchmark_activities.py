@@ -0,0 +1,67 @@
+"""
+Times the notebook's read, drop and per-type copies against
+`load_activities` with a cold and a warm Parquet cache, on exports made
+by repeating the rows of cardioActivities.csv with new dates.
+
+Run from the project folder:  python -m datasets.benchmark_activities
+"""
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from datasets.activities import activity_views, load_activities
+
+COLS_TO_DROP = ['Friend\'s Tagged', 'Route Name', 'GPX File', 'Activity Id',
+                'Calories Burned', 'Notes']
+
+
+def make_export(path, n, seed=0):
+    rng = np.random.default_rng(seed)
+    export = pd.read_csv('datasets/cardioActivities.csv')
+    export = export.iloc[rng.integers(0, len(export), size=n)]
+    # One activity every few hours, newest first like Runkeeper exports
+    seconds = np.cumsum(rng.integers(3600, 4 * 86400, size=n))
+    export['Date'] = (pd.Timestamp('2019-01-01')
+                      - pd.to_timedelta(seconds, unit='s'))
+    export.to_csv(path, index=False)
+
+
+def notebook_load(path):
+    df_activities = pd.read_csv(path, parse_dates=True, index_col='Date')
+    df_activities.drop(columns=COLS_TO_DROP, inplace=True)
+    df_activities['Type'] = df_activities['Type'].str.replace(
+        'Other', 'Unicycling')
+    return {name: df_activities[df_activities['Type'] == name].copy()
+            for name in ('Running', 'Walking', 'Cycling')}
+
+
+def timed(f, *args, **kwargs):
+    start = time.perf_counter()
+    f(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(sizes=(10000, 100000, 1000000)):
+    folder = tempfile.mkdtemp()
+    try:
+        print('{:>10} {:>12} {:>12} {:>12}'.format(
+            'activities', 'notebook ms', 'cold ms', 'warm ms'))
+        for n in sizes:
+            path = os.path.join(folder, 'cardioActivities_{}.csv'.format(n))
+            cache_dir = os.path.join(folder, 'cache')
+            make_export(path, n)
+            notebook_ms = timed(notebook_load, path)
+            cold_ms = timed(lambda: activity_views(
+                load_activities(path, cache_dir=cache_dir)))
+            warm_ms = timed(lambda: activity_views(
+                load_activities(path, cache_dir=cache_dir)))
+            print('{:>10} {:12.1f} {:12.1f} {:12.1f}'.format(
+                n, notebook_ms, cold_ms, warm_ms))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Times seasonal decomposition of many athletes' weekly distances: one
+`sm.tsa.seasonal_decompose` call per athlete against one batched
+`decompose`, and recomputing after a new week against `TrendTracker.update`.
+Checks that all of them agree.
+
+Run from the project folder:  python -m datasets.benchmark_trend
+"""
+import time
+import numpy as np
+import statsmodels.api as sm
+from datasets.trend import TrendTracker, decompose
+
+
+def make_distances(n_athletes, n_weeks, period=52, seed=0):
+    # Weekly km with a yearly cycle, a slow drift and noise
+    rng = np.random.default_rng(seed)
+    weeks = np.arange(n_weeks)
+    season = 5 * np.sin(2 * np.pi * weeks / period)
+    drift = rng.normal(0, 0.02, size=(n_athletes, 1)) * weeks
+    noise = rng.normal(0, 4, size=(n_athletes, n_weeks))
+    return np.clip(20 + season + drift + noise, 0, None)
+
+
+def timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
+
+
+def main(athletes=(100, 1000, 5000), n_weeks=312, period=52):
+    print('{:>9} {:>14} {:>12} {:>14} {:>12}'.format(
+        'athletes', 'statsmodels s', 'batched s', 'recompute ms',
+        'update ms'))
+    for n in athletes:
+        distances = make_distances(n, n_weeks + 1, period)
+        history, new_week = distances[:, :-1], distances[:, -1:]
+
+        def per_athlete():
+            return [sm.tsa.seasonal_decompose(row, period=period,
+                                              extrapolate_trend=1).trend
+                    for row in history]
+        trends, statsmodels_seconds = timed(per_athlete)
+        (trend, _, _), batched_seconds = timed(decompose, history, period)
+        assert np.allclose(trend, np.array(trends))
+
+        tracker = TrendTracker(n, period)
+        tracker.update(history)
+        _, recompute_seconds = timed(decompose, distances, period)
+        _, update_seconds = timed(tracker.update, new_week)
+        assert np.allclose(tracker.components()[1],
+                           decompose(distances, period)[1])
+        print('{:>9} {:14.3f} {:12.3f} {:14.2f} {:12.2f}'.format(
+            n, statsmodels_seconds, batched_seconds,
+            recompute_seconds * 1000, update_seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
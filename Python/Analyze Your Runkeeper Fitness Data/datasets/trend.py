@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _trend_filter(period):
+    # statsmodels' centred moving average: halved end weights for even periods
+    if period % 2 == 0:
+        return np.array([0.5] + [1] * (period - 1) + [0.5]) / period
+    return np.repeat(1.0 / period, period)
+
+
+def _line_through(trend, start, stop, at):
+    # Least-squares line through trend[:, start:stop], evaluated at `at`
+    t = np.arange(start, stop, dtype=float)
+    y = trend[:, start:stop]
+    t_mean, y_mean = t.mean(), y.mean(axis=1, keepdims=True)
+    slope = (y - y_mean) @ (t - t_mean) / ((t - t_mean) ** 2).sum()
+    return y_mean + slope[:, np.newaxis] * (at - t_mean)
+
+
+def _extrapolate(trend, front, back, npoints):
+    # Fills the undefined ends of trend like statsmodels' _extrapolate_trend
+    n_obs = trend.shape[1]
+    trend[:, :front] = _line_through(trend, front, min(front + npoints, back),
+                                     np.arange(front))
+    trend[:, back + 1:] = _line_through(trend, max(front, back - npoints),
+                                        back, np.arange(back + 1, n_obs))
+    return trend
+
+
+def _seasonal(detrended, period):
+    # Mean of every phase over the cycles, centred on zero and repeated
+    n_series, n_obs = detrended.shape
+    cycles = -(-n_obs // period)
+    padded = np.full((n_series, cycles * period), np.nan)
+    padded[:, :n_obs] = detrended
+    averages = np.nanmean(padded.reshape(n_series, cycles, period), axis=1)
+    averages -= averages.mean(axis=1, keepdims=True)
+    return np.tile(averages, cycles)[:, :n_obs]
+
+
+def decompose(values, period=52, extrapolate_trend=1):
+    """
+    Additive moving-average decomposition of one or many series at once.
+
+    Gives the trend, seasonal and residual components of
+    `sm.tsa.seasonal_decompose(series, period=period,
+    extrapolate_trend=extrapolate_trend)`, but for every row of a 2d
+    `values` array (one athlete per row) in a few array operations instead
+    of one statsmodels call per series.  A 1d array is treated as a single
+    series.  Returns `(trend, seasonal, resid)` shaped like `values`.
+    """
+    values = np.asarray(values, dtype=float)
+    squeeze = values.ndim == 1
+    values = np.atleast_2d(values)
+    n_obs = values.shape[1]
+    if n_obs < 2 * period:
+        raise ValueError('decompose needs 2 complete cycles of {} values, '
+                         'got {}'.format(period, n_obs))
+
+    filt = _trend_filter(period)
+    half = len(filt) // 2
+    trend = np.full(values.shape, np.nan)
+    trend[:, half:n_obs - half] = sliding_window_view(
+        values, len(filt), axis=1) @ filt
+    if extrapolate_trend > 0:
+        trend = _extrapolate(trend, half, n_obs - 1 - half,
+                             extrapolate_trend + 1)
+    seasonal = _seasonal(values - trend, period)
+    resid = values - trend - seasonal
+    if squeeze:
+        return trend[0], seasonal[0], resid[0]
+    return trend, seasonal, resid
+
+
+def decompose_series(series, period=52, extrapolate_trend=1):
+    """
+    `decompose` for a pandas Series, as a DataFrame with its index and
+    observed, trend, seasonal and resid columns.
+    """
+    trend, seasonal, resid = decompose(series.to_numpy(), period,
+                                       extrapolate_trend)
+    return pd.DataFrame({'observed': series.to_numpy(dtype=float),
+                         'trend': trend, 'seasonal': seasonal,
+                         'resid': resid}, index=series.index)
+
+
+class TrendTracker:
+    """
+    The decomposition of growing weekly series, kept up to date as weeks
+    arrive.
+
+    `update` takes the new weeks of every tracked series (one row each).
+    Only the moving averages that the new weeks complete are computed, and
+    their detrended values are added to running sums per phase of the
+    period, so an update costs the number of new weeks, not the length of
+    the history.  The extrapolated ends, which move with every update, are
+    added back when the components are read.  Results equal `decompose` on
+    the full history.
+    """
+
+    def __init__(self, n_series=1, period=52, extrapolate_trend=1):
+        self.period = period
+        self.extrapolate_trend = extrapolate_trend
+        self._filt = _trend_filter(period)
+        self._half = len(self._filt) // 2
+        self._values = np.empty((n_series, 0))
+        self._n_obs = 0
+        # Moving averages of the interior weeks, from week self._half on
+        self._interior = np.empty((n_series, 0))
+        self._n_interior = 0
+        self._sums = np.zeros((n_series, period))
+        self._counts = np.zeros(period, dtype=np.intp)
+
+    @property
+    def n_obs(self):
+        return self._n_obs
+
+    def _grow(self, buffer, used, extra):
+        # Doubles the capacity of a (n_series, capacity) buffer as needed
+        if used + extra <= buffer.shape[1]:
+            return buffer
+        grown = np.empty((buffer.shape[0], max(2 * buffer.shape[1],
+                                               used + extra)))
+        grown[:, :used] = buffer[:, :used]
+        return grown
+
+    def update(self, new_values):
+        """
+        Appends `new_values`, shaped (n_series, new weeks) or (new weeks,)
+        for a single series.
+        """
+        new_values = np.asarray(new_values, dtype=float)
+        if new_values.ndim == 1:
+            new_values = new_values[np.newaxis]
+        k = new_values.shape[1]
+        self._values = self._grow(self._values, self._n_obs, k)
+        self._values[:, self._n_obs:self._n_obs + k] = new_values
+        self._n_obs += k
+
+        # The windows centred on the weeks that are now complete
+        first = self._half + self._n_interior
+        last = self._n_obs - 1 - self._half
+        if last < first:
+            return
+        window = self._values[:, first - self._half:last + self._half + 1]
+        trend = sliding_window_view(window, len(self._filt), axis=1) @ \
+            self._filt
+        n_new = trend.shape[1]
+        self._interior = self._grow(self._interior, self._n_interior, n_new)
+        self._interior[:, self._n_interior:self._n_interior + n_new] = trend
+        self._n_interior += n_new
+
+        phases = np.arange(first, last + 1) % self.period
+        detrended = self._values[:, first:last + 1] - trend
+        np.add.at(self._sums.T, phases, detrended.T)
+        np.add.at(self._counts, phases, 1)
+
+    def _ends(self):
+        # The extrapolated trend of the first and last self._half weeks
+        front, back = self._half, self._n_obs - 1 - self._half
+        npoints = self.extrapolate_trend + 1
+        # Same points as statsmodels, counted from the first interior week
+        last = self._n_interior - 1
+        interior = self._interior[:, :self._n_interior]
+        head = _line_through(interior, 0, min(npoints, last),
+                             np.arange(-front, 0))
+        tail = _line_through(interior, max(0, last - npoints), last,
+                             np.arange(last + 1, last + 1 + self._half))
+        return head, tail, front, back
+
+    def period_averages(self):
+        """
+        The seasonal component over one period, shaped (n_series, period).
+        """
+        if self._n_obs < 2 * self.period:
+            raise ValueError('TrendTracker needs 2 complete cycles of {} '
+                             'values, got {}'.format(self.period,
+                                                     self._n_obs))
+        sums = self._sums.copy()
+        counts = self._counts.copy()
+        if self.extrapolate_trend > 0:
+            head, tail, front, back = self._ends()
+            for weeks, trend in ((np.arange(front), head),
+                                 (np.arange(back + 1, self._n_obs), tail)):
+                np.add.at(sums.T, weeks % self.period,
+                          (self._values[:, weeks] - trend).T)
+                np.add.at(counts, weeks % self.period, 1)
+        averages = sums / counts
+        return averages - averages.mean(axis=1, keepdims=True)
+
+    def trend(self):
+        """
+        The trend of every week so far, shaped (n_series, n_obs).
+        """
+        trend = np.full((self._values.shape[0], self._n_obs), np.nan)
+        trend[:, self._half:self._half + self._n_interior] = \
+            self._interior[:, :self._n_interior]
+        if self.extrapolate_trend > 0 and self._n_obs >= 2 * self.period:
+            head, tail, front, back = self._ends()
+            trend[:, :front] = head
+            trend[:, back + 1:] = tail
+        return trend
+
+    def components(self):
+        """
+        `(trend, seasonal, resid)` for the full history, as `decompose`
+        returns them.
+        """
+        values = self._values[:, :self._n_obs]
+        trend = self.trend()
+        seasonal = np.tile(self.period_averages(),
+                           self._n_obs // self.period + 1)[:, :self._n_obs]
+        return trend, seasonal, values - trend - seasonal
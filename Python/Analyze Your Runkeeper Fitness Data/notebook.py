@@ -84,11 +84,25 @@ df_run = df_activities[df_activities['Type'] == 'Running'].copy()
 df_walk = df_activities[df_activities['Type'] == 'Walking'].copy()
 df_cycle = df_activities[df_activities['Type'] == 'Cycling'].copy()
 
+# datasets/activities.py parses the export once into a Parquet cache with a
+# categorical Type and an increasing DatetimeIndex, then splits every type
+# in one grouping pass.  All of these frames slice oldest date first:
+# from datasets.activities import activity_views, load_activities
+# df_activities = load_activities(cache_dir='datasets/cache')
+# views = activity_views(df_activities)
+# df_run, df_walk = views['Running'], views['Walking']
+# df_run['2013':'2018']
+
 # Filling missing values with counted means  
 df_walk['Average Heart Rate (bpm)'].fillna(110, inplace=True)
 df_run['Average Heart Rate (bpm)'].fillna(int(avg_hr_run), inplace=True)
 df_cycle['Average Heart Rate (bpm)'].fillna(int(avg_hr_cycle), inplace=True)
 
+# Or fill every type in one grouped pass over the whole frame, with walks
+# at 110 bpm as above:
+# from datasets.activities import impute_heart_rate
+# df_activities = impute_heart_rate(df_activities)
+
 # Count missing values for each column in running data
 df_run.isnull().sum()
 
@@ -261,6 +275,11 @@ import statsmodels.api as sm
 df_run_dist_wkly = df_run['Distance (km)']['2018':'2013'].resample('W').bfill()
 decomposed = sm.tsa.seasonal_decompose(df_run_dist_wkly, extrapolate_trend=1, freq=52)
 
+# The same components without statsmodels, for one runner or a 2d array of
+# many (newer statsmodels spells freq=52 as period=52):
+# from datasets.trend import decompose_series
+# decomposed = decompose_series(df_run_dist_wkly, period=52)
+
 # Create plot
 fig = plt.figure(figsize=(12, 5))
 
@@ -344,6 +363,10 @@ for i in dist_climb_cols:
 print('Summary statistics for different training types:')
 df_summary.stack()
 
+# The same report straight from the imputed activities, without appending:
+# from datasets.activities import type_summary
+# type_summary(df_activities).stack()
+
 
 # In[183]:
 
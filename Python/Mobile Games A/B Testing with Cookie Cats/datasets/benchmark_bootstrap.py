@@ -0,0 +1,46 @@
+"""
+Times the notebook's `df.sample(...).groupby(...)` bootstrap of 1-day and
+7-day retention against `bootstrap_means`, and checks that both give the
+same bootstrap distributions.
+
+Run from the project folder:  python -m datasets.benchmark_bootstrap
+"""
+import time
+import numpy as np
+import pandas as pd
+from datasets.bootstrap import METRICS, bootstrap_means
+
+
+def notebook_bootstrap(df, n_boot):
+    boots = {}
+    for metric in METRICS:
+        boots[metric] = pd.DataFrame(
+            [df.sample(frac=1, replace=True).groupby('version')[metric].mean()
+             for i in range(n_boot)])
+    return boots
+
+
+def main(notebook_boot=500, n_boot=(10000, 100000, 1000000)):
+    df = pd.read_csv('datasets/cookie_cats.csv')
+    start = time.perf_counter()
+    reference = notebook_bootstrap(df, notebook_boot)
+    print('{:>12} {:>10} {:>10}'.format('method', 'resamples', 'seconds'))
+    print('{:>12} {:>10} {:10.3f}'.format(
+        'notebook', notebook_boot, time.perf_counter() - start))
+    for method in ('multinomial', 'poisson'):
+        for n in n_boot:
+            start = time.perf_counter()
+            boots = bootstrap_means(df, n_boot=n, method=method,
+                                    random_state=0, n_jobs=None)
+            print('{:>12} {:>10} {:10.3f}'.format(
+                method, n, time.perf_counter() - start))
+        # Same centre and spread as the notebook's resamples, up to noise
+        for metric in METRICS:
+            assert np.allclose(boots[metric].mean(),
+                               reference[metric].mean(), atol=5e-4)
+            assert np.allclose(boots[metric].std(),
+                               reference[metric].std(), rtol=0.2)
+
+
+if __name__ == '__main__':
+    main()
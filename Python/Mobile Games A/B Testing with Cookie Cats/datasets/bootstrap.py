@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+METRICS = ('retention_1', 'retention_7')
+
+
+def cell_counts(df, group='version', metrics=METRICS):
+    """
+    Counts the players of each group in every combination of the boolean
+    `metrics`.
+
+    Returns `(groups, counts)`: `counts[g, c]` is the number of players of
+    `groups[g]` whose metric j is True exactly when bit j of `c` is set.
+    Resampling players only changes these counts, so they are all a
+    bootstrap of the metrics' means needs.
+    """
+    cells = np.zeros(len(df), dtype=np.intp)
+    for bit, metric in enumerate(metrics):
+        values = df[metric]
+        if values.dtype != bool:
+            raise ValueError('{} must be boolean, got {}'.format(
+                metric, values.dtype))
+        cells |= values.to_numpy().astype(np.intp) << bit
+    codes, groups = pd.factorize(df[group], sort=True)
+    n_cells = 1 << len(metrics)
+    counts = np.bincount(codes * n_cells + cells,
+                         minlength=len(groups) * n_cells)
+    return groups, counts.reshape(len(groups), n_cells)
+
+
+def _draw_counts(args):
+    # Worker for bootstrap_means: resampled cell counts for one batch
+    counts, n_boot, method, seed = args
+    rng = np.random.default_rng(seed)
+    flat = counts.ravel()
+    if method == 'multinomial':
+        # Drawing len(df) players with replacement, like df.sample
+        draws = rng.multinomial(flat.sum(), flat / flat.sum(), size=n_boot)
+    else:
+        # Every player weighted by an independent Poisson(1) count
+        draws = rng.poisson(flat, size=(n_boot, len(flat)))
+    return draws.reshape((n_boot,) + counts.shape)
+
+
+def bootstrap_means(df, metrics=METRICS, group='version', n_boot=10000,
+                    method='multinomial', random_state=None, n_jobs=1,
+                    batch_size=10000):
+    """
+    Bootstraps the mean of each boolean metric in every group.
+
+    method='multinomial' resamples all players with replacement, which is
+    what the notebook's `df.sample(frac=1, replace=True)` does, and
+    method='poisson' gives every player an independent Poisson(1) weight.
+    Either way only the counts from `cell_counts` are drawn, in batches of
+    `batch_size` resamples, so no frame is copied or regrouped.  Batches
+    are spread over `n_jobs` worker processes (all cores when None); they
+    are cheap enough that this only pays off for millions of resamples.
+    Each batch has its own seed from `random_state`, so the result does not
+    depend on `n_jobs`.
+
+    Returns a dict mapping each metric to a DataFrame with one row per
+    resample and one column per group, like the notebook's `boot_1d`.
+    """
+    if method not in ('multinomial', 'poisson'):
+        raise ValueError("method must be 'multinomial' or 'poisson', "
+                         "got {!r}".format(method))
+    groups, counts = cell_counts(df, group, metrics)
+    sizes = [min(batch_size, n_boot - start)
+             for start in range(0, n_boot, batch_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    jobs = [(counts, size, method, seed) for size, seed in zip(sizes, seeds)]
+    if n_jobs == 1:
+        batches = [_draw_counts(job) for job in jobs]
+    else:
+        n_jobs = n_jobs or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            batches = list(executor.map(_draw_counts, jobs))
+    draws = np.concatenate(batches)
+
+    # Players per group and players with each metric True per group
+    bits = (np.arange(counts.shape[1])[:, np.newaxis]
+            >> np.arange(len(metrics))) & 1
+    totals = draws.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (draws @ bits) / totals[:, :, np.newaxis]
+    columns = pd.Index(groups, name=group)
+    return {metric: pd.DataFrame(means[:, :, j], columns=columns)
+            for j, metric in enumerate(metrics)}
@@ -128,6 +128,12 @@ for i in range(500):
 # Transforming the list to a DataFrame
 boot_1d = pd.DataFrame(boot_1d)
 
+# Both retention metrics, 10,000 resamples each, in a fraction of a second
+# by drawing how many players land in each version/retention combination:
+# from datasets.bootstrap import bootstrap_means
+# boots = bootstrap_means(df, n_boot=10000, random_state=0)
+# boot_1d, boot_7d = boots['retention_1'], boots['retention_7']
+
 # A Kernel Density Estimate plot of the bootstrap distributions
 boot_1d.plot(kind = 'kde')
 ax.set_xlabel("% difference in means")
@@ -0,0 +1,149 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from numpy.lib.format import open_memmap
+from skimage import io
+from sklearn.model_selection import train_test_split
+
+# StandardScaler leaves features with a smaller scale than this unscaled
+_EPS = 10 * np.finfo(np.float64).eps
+
+
+def standardize_images(images):
+    """
+    Standardizes each column of each channel of every image on its own, in
+    place, the way the notebook scales each training image.  Returns the
+    per-image `(mean, std)` arrays of shape (N, 1, width, channels).
+    """
+    height = images.shape[1]
+    mean = images.mean(axis=1, keepdims=True)
+    images -= mean
+    std = np.sqrt(np.einsum('nhwc,nhwc->nwc', images,
+                            images) / height)[:, np.newaxis]
+    std[std < _EPS] = 1.0
+    images /= std
+    return mean, std
+
+
+def scale_features(train_features, test_features):
+    """
+    Vectorized, in-place equivalent of the notebook's `scale_features`.
+
+    The notebook standardizes every column of every channel of each
+    training image on its own, then transforms the test images with the
+    scaler left over from the last training channel.  This reproduces that
+    without a Python loop, so `pretrained_model.h5` still sees the inputs it
+    was trained on.
+    """
+    mean, std = standardize_images(train_features)
+
+    # Per-column statistics of the last channel of the last image
+    test_features -= mean[-1, 0, :, -1][:, np.newaxis]
+    test_features /= std[-1, 0, :, -1][:, np.newaxis]
+
+
+def standardize_channels(train_features, *other_features):
+    """
+    Standardizes image tensors of shape (N, height, width, channels) in place
+    with one mean and standard deviation per channel, computed over the whole
+    training tensor and applied to `train_features` and every array in
+    `other_features` (e.g. test and eval).  Returns `(mean, std)`.
+
+    This is the usual way to normalize CNN inputs, but it differs from the
+    notebook's per-image scaling, so models trained on one will not score
+    correctly on inputs scaled by the other.
+    """
+    channels = train_features.shape[-1]
+    count = train_features.size // channels
+    # einsum reduces over every axis but the channels in one pass, and sums
+    # the squares without materializing a squared copy
+    flat = train_features.reshape(-1, channels)
+    mean = np.einsum('ij->j', flat, dtype=np.float64) / count
+    train_features -= mean.astype(train_features.dtype)
+    flat = train_features.reshape(-1, channels)
+    std = np.sqrt(np.einsum('ij,ij->j', flat, flat, dtype=np.float64) / count)
+    std[std < _EPS] = 1.0
+    train_features /= std.astype(train_features.dtype)
+    for features in other_features:
+        features -= mean.astype(features.dtype)
+        features /= std.astype(features.dtype)
+    return mean, std
+
+
+def _read_image(path):
+    # Worker for load_images; JPEG pixels arrive as uint8
+    return io.imread(path)
+
+
+def _cache_path(cache_dir, paths, dtype):
+    # The key changes whenever an image is added, reordered or modified
+    key = hashlib.sha1(np.dtype(dtype).str.encode())
+    for path in paths:
+        key.update('{}:{}\n'.format(path, os.path.getmtime(path)).encode())
+    return os.path.join(cache_dir, 'bee_images_{}.npy'.format(key.hexdigest()))
+
+
+def load_images(image_ids, root='datasets', dtype=np.float32, n_jobs=None,
+                cache_dir=None):
+    """
+    Loads `root/<id>.jpg` for every id into one array of shape
+    (N, height, width, channels), in the order of `image_ids`.
+
+    Images are decoded by `n_jobs` worker processes (all cores when None,
+    serially when 1) straight into a preallocated `dtype` array; uint8
+    keeps the raw pixels at a quarter of the float32 size.  With a
+    `cache_dir` the array is written to a .npy file there and later calls
+    with the same images return it memory-mapped read-only.
+    """
+    paths = [os.path.join(root, '{}.jpg'.format(i)) for i in image_ids]
+    if cache_dir is not None:
+        cache_path = _cache_path(cache_dir, paths, dtype)
+        if os.path.exists(cache_path):
+            return np.load(cache_path, mmap_mode='r')
+
+    # The first image fixes the shape of the array
+    first = _read_image(paths[0])
+    shape = (len(paths),) + first.shape
+    if cache_dir is None:
+        images = np.empty(shape, dtype=dtype)
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        images = open_memmap(cache_path + '.tmp.npy', mode='w+', dtype=dtype,
+                             shape=shape)
+    images[0] = first
+    if n_jobs == 1:
+        for i, path in enumerate(paths[1:], start=1):
+            images[i] = _read_image(path)
+    else:
+        n_jobs = n_jobs or os.cpu_count()
+        chunksize = max(1, len(paths) // (4 * n_jobs))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            decoded = executor.map(_read_image, paths[1:], chunksize=chunksize)
+            for i, img in enumerate(decoded, start=1):
+                images[i] = img
+
+    if cache_dir is not None:
+        # Rename into place so an interrupted run never leaves half a cache
+        images.flush()
+        del images
+        os.replace(cache_path + '.tmp.npy', cache_path)
+        return np.load(cache_path, mmap_mode='r')
+    return images
+
+
+def split_indices(n_images, eval_size=0.2, test_size=0.4, random_state=52):
+    """
+    Returns `(interim, eval, train, test)` index arrays that select the same
+    images as the notebook's two train_test_split calls on the full tensor.
+
+    The split only depends on the number of rows, so splitting positions
+    gives the same result without copying the images.  Index the tensor
+    (`X[train]`) only for the sets that are needed.
+    """
+    interim, eval_ = train_test_split(np.arange(n_images),
+                                      test_size=eval_size,
+                                      random_state=random_state)
+    train, test = train_test_split(interim, test_size=test_size,
+                                   random_state=random_state)
+    return interim, eval_, train, test
@@ -0,0 +1,114 @@
+import os
+import time
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+import numpy as np
+from skimage import io
+from datasets.bee_images import standardize_images
+
+
+class BeeScorer:
+    """
+    Scores bee images from disk with a Keras model loaded once.
+
+    A background thread decodes and standardizes the next `prefetch` batches
+    while the model predicts the current one, so decoding and inference
+    overlap.  Images are scaled per image like the notebook's training
+    images, which is what `pretrained_model.h5` was fitted on.
+    """
+
+    def __init__(self, model_path='datasets/pretrained_model.h5',
+                 batch_size=64, prefetch=4):
+        # Imported here so that the decoding helpers work without TensorFlow
+        import keras
+        self.model = keras.models.load_model(model_path)
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+
+    def _batches(self, paths):
+        # Yields (start, batch) pairs decoded by a background thread
+        queue = Queue(maxsize=max(1, self.prefetch))
+        # Set when the consumer stops early or the model raises, so the
+        # producer does not block on a full queue and hold its batches
+        stop = Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for start in range(0, len(paths), self.batch_size):
+                    chunk = paths[start:start + self.batch_size]
+                    batch = np.stack([io.imread(path) for path in chunk])
+                    batch = batch.astype(np.float32)
+                    standardize_images(batch)
+                    if not put((start, batch)):
+                        return
+            except Exception as error:
+                put(error)
+                return
+            put(None)
+
+        Thread(target=produce, daemon=True).start()
+        try:
+            while True:
+                item = queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Drop whatever was decoded ahead
+            while True:
+                try:
+                    queue.get_nowait()
+                except Empty:
+                    break
+
+    def score_paths(self, paths):
+        """
+        Returns `(probabilities, stats)` for the images in `paths`.
+
+        `probabilities` has one row per path.  `stats` holds the overall
+        `images_per_sec` and the `p50_ms`, `p90_ms` and `p99_ms` percentiles
+        of the time the model spent on each batch.
+        """
+        paths = list(paths)
+        probabilities = None
+        latencies = []
+        start_time = time.perf_counter()
+        batches = self._batches(paths)
+        try:
+            for start, batch in batches:
+                batch_start = time.perf_counter()
+                proba = np.asarray(self.model.predict_on_batch(batch))
+                latencies.append(time.perf_counter() - batch_start)
+                if probabilities is None:
+                    probabilities = np.empty(
+                        (len(paths),) + proba.shape[1:], dtype=proba.dtype)
+                probabilities[start:start + len(batch)] = proba
+        finally:
+            # Stops the decoding thread at once if predict_on_batch raised
+            batches.close()
+        elapsed = time.perf_counter() - start_time
+
+        latencies = np.array(latencies) * 1000
+        stats = {'images': len(paths),
+                 'batch_size': self.batch_size,
+                 'images_per_sec': len(paths) / elapsed if elapsed else 0.0}
+        for q in (50, 90, 99):
+            stats['p{}_ms'.format(q)] = (np.percentile(latencies, q)
+                                         if len(latencies) else 0.0)
+        return probabilities, stats
+
+    def score_ids(self, image_ids, root='datasets'):
+        paths = [os.path.join(root, '{}.jpg'.format(i)) for i in image_ids]
+        return self.score_paths(paths)
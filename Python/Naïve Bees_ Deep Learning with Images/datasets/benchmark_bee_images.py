@@ -0,0 +1,44 @@
+"""
+Times the notebook's per-image StandardScaler loop against the vectorized
+scale_features and standardize_channels on 10,000+ random 50x50 images.
+
+Run from the project folder:  python -m datasets.benchmark_bee_images
+"""
+import time
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from datasets.bee_images import scale_features, standardize_channels
+
+
+def loop_scale_features(train_features, test_features):
+    # The notebook's implementation
+    ss = StandardScaler()
+    for image in train_features:
+        for channel in range(image.shape[2]):
+            image[:, :, channel] = ss.fit_transform(image[:, :, channel])
+    for image in test_features:
+        for channel in range(image.shape[2]):
+            image[:, :, channel] = ss.transform(image[:, :, channel])
+
+
+def time_scaling(function, train, test):
+    train, test = train.copy(), test.copy()
+    start = time.perf_counter()
+    function(train, test)
+    return time.perf_counter() - start
+
+
+def main(n_train=10000, n_test=2500):
+    rng = np.random.RandomState(52)
+    train = rng.randint(0, 256, (n_train, 50, 50, 3)).astype(np.float64)
+    test = rng.randint(0, 256, (n_test, 50, 50, 3)).astype(np.float64)
+    print('{} train and {} test images'.format(n_train, n_test))
+    for name, function in (('loop', loop_scale_features),
+                           ('scale_features', scale_features),
+                           ('standardize_channels', standardize_channels)):
+        print('\t{:<22} {:8.3f} s'.format(
+            name, time_scaling(function, train, test)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Reports CPU throughput and per-batch latency of pretrained_model.h5 on the
+labelled bee images at several batch sizes.
+
+Run from the project folder:  python -m datasets.benchmark_bee_inference
+"""
+import os
+# Measure the CPU ceiling even on machines with a GPU
+os.environ.setdefault('CUDA_VISIBLE_DEVICES', '-1')
+import pandas as pd
+from datasets.bee_inference import BeeScorer
+
+
+def main(batch_sizes=(1, 16, 64, 256, 1024), prefetch=4):
+    labels = pd.read_csv('datasets/labels.csv', index_col=0)
+    scorer = BeeScorer(prefetch=prefetch)
+    # One untimed pass builds the predict function and warms the file cache
+    scorer.score_ids(labels.index[:scorer.batch_size])
+    print('{:>6} {:>12} {:>9} {:>9} {:>9}'.format(
+        'batch', 'images/sec', 'p50 ms', 'p90 ms', 'p99 ms'))
+    for batch_size in batch_sizes:
+        scorer.batch_size = batch_size
+        _, stats = scorer.score_ids(labels.index)
+        print('{:>6} {:12.1f} {:9.2f} {:9.2f} {:9.2f}'.format(
+            batch_size, stats['images_per_sec'], stats['p50_ms'],
+            stats['p90_ms'], stats['p99_ms']))
+
+
+if __name__ == '__main__':
+    main()
@@ -114,6 +114,13 @@ X = np.array(image_list)
 
 print(X.shape)
 
+# The same array can be decoded in parallel straight into float32 (or uint8)
+# without the intermediate float64 list, and split by index instead of copy
+# from datasets.bee_images import load_images, split_indices
+# X = load_images(labels.index, dtype=np.float32)
+# interim_idx, eval_idx, train_idx, test_idx = split_indices(len(X))
+# x_train, y_train = X[train_idx], y[train_idx]
+
 
 # In[17]:
 
@@ -178,6 +185,10 @@ def scale_features(train_features, test_features):
 scale_features(x_interim, x_eval)
 scale_features(x_train, x_test)
 
+# datasets/bee_images.py has a loop-free version of scale_features with the
+# same results, and standardize_channels for one set of per-channel
+# statistics over the whole training tensor (for models trained from scratch)
+
 
 # In[21]:
 
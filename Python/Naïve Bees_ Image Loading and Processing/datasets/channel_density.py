@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from matplotlib import pyplot as plt
+
+
+def _kernel_density(counts, n, bandwidth, pad):
+    # Gaussian KDE of integer data evaluated on the integer grid
+    # -pad..255+pad, computed as the value histogram convolved with the
+    # sampled kernel; at those points it equals the per-pixel KDE up to the
+    # kernel's truncation at `pad`, which callers set to 4 bandwidths
+    offsets = np.arange(-pad, pad + 1)
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= bandwidth * np.sqrt(2 * np.pi) * n
+    return np.convolve(counts, kernel)
+
+
+def _scott_bandwidth(counts, n):
+    # Scott's rule, as used by scipy's gaussian_kde behind .plot.density()
+    values = np.arange(len(counts))
+    mean = counts @ values / n
+    var = counts @ (values - mean) ** 2 / max(n - 1, 1)
+    return max(np.sqrt(var), 1e-3) * n ** (-1 / 5)
+
+
+def channel_densities(images, bandwidth=None):
+    """
+    Densities of the uint8 values of every channel of every image.
+
+    `images` has shape (N, height, width, channels), or (height, width,
+    channels) for a single image.  Pixel values are counted into 256 bins
+    one channel at a time, so the counting only ever needs temporary memory
+    for one channel, and each histogram is smoothed with a Gaussian kernel
+    whose width follows Scott's rule (or `bandwidth`, in pixel values).  Returns `(x, densities)` where `densities[i, c]` is evaluated
+    at the integer values in `x`, which extend past 0 and 255 like a KDE.
+    """
+    images = np.asarray(images)
+    if images.dtype != np.uint8:
+        raise ValueError('channel_densities needs uint8 pixels, '
+                         'got {}'.format(images.dtype))
+    if images.ndim == 3:
+        images = images[np.newaxis]
+    n_images, channels = images.shape[0], images.shape[-1]
+    n = images[0, ..., 0].size
+
+    # Row i * channels + c counts channel c of image i
+    counts = np.empty((n_images * channels, 256))
+    for i in range(n_images):
+        for c in range(channels):
+            counts[i * channels + c] = np.bincount(
+                images[i, ..., c].ravel(), minlength=256)
+
+    bandwidths = [bandwidth or _scott_bandwidth(row, n) for row in counts]
+    pad = int(np.ceil(4 * max(bandwidths)))
+    densities = np.array([_kernel_density(row, n, bw, pad)
+                          for row, bw in zip(counts, bandwidths)])
+    x = np.arange(-pad, 256 + pad)
+    return x, densities.reshape(n_images, channels, -1)
+
+
+def plot_kde(channel, color, method='kde', ax=None):
+    """ Plots a kernel density estimate for the given data.
+
+        `channel` must be a 2d array
+        `color` must be a color string, e.g. 'r', 'g', or 'b'
+        `method` is 'kde' for the notebook's per-pixel pandas density, or
+        'hist' for practically the same curve from a 256-bin histogram
+        (uint8 only), which takes milliseconds even on full-resolution
+        photos
+    """
+    if method == 'kde':
+        data = channel.flatten()
+        return pd.Series(data).plot.density(c=color, ax=ax)
+    if method != 'hist':
+        raise ValueError("method must be 'kde' or 'hist', "
+                         "got {!r}".format(method))
+    x, densities = channel_densities(channel[:, :, np.newaxis])
+    ax = ax or plt.gca()
+    ax.plot(x, densities[0, 0], c=color)
+    ax.set_ylabel('Density')
+    return ax
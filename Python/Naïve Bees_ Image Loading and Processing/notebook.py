@@ -158,6 +158,9 @@ def plot_kde(channel, color):
     data = channel.flatten()
     return pd.Series(data).plot.density(c=color)
 
+# For full-resolution photos, datasets/channel_density.py draws practically the
+# same curve from a 256-bin histogram: plot_kde(channel, color, method='hist')
+
 # create the list of channels
 channels = ['r', 'g', 'b']
     
@@ -331,6 +334,11 @@ def process_image(path):
 for img_path in image_paths:
     process_image(Path(img_path))
 
+# For thousands of photos, run the same transforms in a worker pool and skip
+# images whose outputs are already up to date
+# from datasets.bee_processing import process_images
+# print(process_images(image_paths, 'saved_images', skip='mtime'))
+
 
 # In[21]:
 
@@ -0,0 +1,97 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+from skimage.feature import hog
+from skimage.color import rgb2gray
+
+
+def get_image(row_id, root="datasets/"):
+    """
+    Converts an image number into the file path where the image is located,
+    opens the image, and returns the image as a numpy array.
+    """
+    filename = "{}.jpg".format(row_id)
+    file_path = os.path.join(root, filename)
+    img = Image.open(file_path)
+    return np.array(img)
+
+
+def create_features(img, pixels_per_cell=(16, 16), block_norm='L2-Hys'):
+    # flatten three channel color image
+    color_features = img.flatten()
+    # convert image to grayscale
+    gray_image = rgb2gray(img)
+    # get HOG features from grayscale image
+    hog_features = hog(gray_image, block_norm=block_norm,
+                       pixels_per_cell=pixels_per_cell)
+    # combine color and hog features into a single array
+    flat_features = np.hstack((color_features, hog_features))
+    return flat_features
+
+
+def _cache_path(cache_dir, image_path, img_id, pixels_per_cell, block_norm,
+                dtype):
+    # The same id under another root, or another dtype, is another entry
+    source = hashlib.sha1(os.path.abspath(image_path).encode()).hexdigest()
+    return os.path.join(cache_dir, "{}_{}x{}_{}_{}_{}.npy".format(
+        img_id, pixels_per_cell[0], pixels_per_cell[1], block_norm,
+        np.dtype(dtype).name, source[:12]))
+
+
+def _image_features(args):
+    # Worker for create_feature_matrix; reads and refreshes the cache
+    img_id, root, cache_dir, pixels_per_cell, block_norm, dtype = args
+    if cache_dir is not None:
+        image_path = os.path.join(root, "{}.jpg".format(img_id))
+        cache_path = _cache_path(cache_dir, image_path, img_id,
+                                 pixels_per_cell, block_norm, dtype)
+        if (os.path.exists(cache_path) and
+                os.path.getmtime(cache_path) >= os.path.getmtime(image_path)):
+            return np.load(cache_path).astype(dtype, copy=False)
+    features = create_features(get_image(img_id, root), pixels_per_cell,
+                               block_norm).astype(dtype)
+    if cache_dir is not None:
+        # Rename into place so a concurrent reader never sees half a file
+        tmp_path = "{}.{}.npy".format(cache_path, os.getpid())
+        np.save(tmp_path, features)
+        os.replace(tmp_path, cache_path)
+    return features
+
+
+def create_feature_matrix(label_dataframe, root="datasets/", n_jobs=None,
+                          cache_dir=None, pixels_per_cell=(16, 16),
+                          block_norm='L2-Hys', dtype=np.float32):
+    """
+    Builds the color + HOG feature matrix for every image in
+    `label_dataframe`, one row per image in index order.
+
+    Images are processed by `n_jobs` worker processes (all cores when None)
+    and each row is written straight into a preallocated `dtype` matrix.
+    With a `cache_dir`, features are saved per image file, HOG parameters
+    and dtype, and reused until the image file changes.
+    """
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    jobs = [(img_id, root, cache_dir, pixels_per_cell, block_norm, dtype)
+            for img_id in label_dataframe.index]
+    if not jobs:
+        return np.empty((0, 0), dtype=dtype)
+
+    # The first row fixes the width of the matrix
+    first = _image_features(jobs[0])
+    feature_matrix = np.empty((len(jobs), len(first)), dtype=dtype)
+    feature_matrix[0] = first
+    if n_jobs == 1:
+        for i, job in enumerate(jobs[1:], start=1):
+            feature_matrix[i] = _image_features(job)
+        return feature_matrix
+
+    n_jobs = n_jobs or os.cpu_count()
+    chunksize = max(1, len(jobs) // (4 * n_jobs))
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        rows = executor.map(_image_features, jobs[1:], chunksize=chunksize)
+        for i, row in enumerate(rows, start=1):
+            feature_matrix[i] = row
+    return feature_matrix
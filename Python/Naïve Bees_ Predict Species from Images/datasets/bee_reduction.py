@@ -0,0 +1,76 @@
+import numpy as np
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from datasets.bee_features import create_feature_matrix
+
+
+def iter_feature_batches(label_dataframe, batch_size=500, **feature_kwargs):
+    """
+    Yields the feature matrix of `label_dataframe` `batch_size` rows at a
+    time.  Pass a `cache_dir` in `feature_kwargs` so that every pass after
+    the first reads the cached features instead of recomputing HOG.
+    """
+    for start in range(0, len(label_dataframe), batch_size):
+        yield create_feature_matrix(
+            label_dataframe.iloc[start:start + batch_size], **feature_kwargs)
+
+
+def fit_reduction(label_dataframe, n_components=350, method='incremental',
+                  batch_size=500, random_state=None, **feature_kwargs):
+    """
+    Fits the notebook's StandardScaler + PCA stage on the images in
+    `label_dataframe` and returns it as a fitted Pipeline.
+
+    method='incremental' makes two passes over the feature batches, one for
+    the scaler and one for an IncrementalPCA, so only `batch_size` rows are
+    in memory at once; `batch_size` must be at least `n_components`.
+    method='randomized' loads a single float32 matrix, standardizes it in
+    place and runs a randomized SVD.  method='full' is the notebook's path.
+    """
+    scaler = StandardScaler()
+    if method == 'incremental':
+        if batch_size < n_components:
+            raise ValueError('batch_size must be at least n_components')
+        pca = IncrementalPCA(n_components=n_components)
+        for batch in iter_feature_batches(label_dataframe, batch_size,
+                                          **feature_kwargs):
+            scaler.partial_fit(batch)
+        for batch in iter_feature_batches(label_dataframe, batch_size,
+                                          **feature_kwargs):
+            # The batch is thrown away afterwards, so scale it in place
+            batch -= scaler.mean_
+            batch /= scaler.scale_
+            pca.partial_fit(batch)
+    elif method in ('randomized', 'full'):
+        if method == 'full':
+            feature_kwargs['dtype'] = np.float64
+        features = create_feature_matrix(label_dataframe, **feature_kwargs)
+        if method == 'randomized':
+            scaler.set_params(copy=False)
+            pca = PCA(n_components=n_components, svd_solver='randomized',
+                      random_state=random_state)
+        else:
+            pca = PCA(n_components=n_components)
+        pca.fit(scaler.fit_transform(features))
+        scaler.set_params(copy=True)
+    else:
+        raise ValueError("method must be 'incremental', 'randomized' or "
+                         "'full', got {!r}".format(method))
+    return Pipeline([('scaler', scaler), ('pca', pca)])
+
+
+def transform_batches(reduction, label_dataframe, batch_size=500,
+                      **feature_kwargs):
+    """
+    Applies a fitted `fit_reduction` pipeline to the images in
+    `label_dataframe` batch by batch, filling one preallocated matrix.
+    """
+    n_components = reduction.named_steps['pca'].n_components_
+    reduced = np.empty((len(label_dataframe), n_components))
+    start = 0
+    for batch in iter_feature_batches(label_dataframe, batch_size,
+                                      **feature_kwargs):
+        reduced[start:start + len(batch)] = reduction.transform(batch)
+        start += len(batch)
+    return reduced
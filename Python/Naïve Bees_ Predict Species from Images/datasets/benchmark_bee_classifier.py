@@ -0,0 +1,43 @@
+"""
+Compares fit time and test AUC of SVC(kernel='linear', probability=True)
+against the calibrated LinearSVC on synthetic 350-component PCA features.
+
+Run from the project folder:  python -m datasets.benchmark_bee_classifier
+"""
+import time
+from sklearn.datasets import make_classification
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+from datasets.bee_classifier import make_linear_classifier, roc
+
+
+def fit_and_score(classifier, X_train, X_test, y_train, y_test):
+    start = time.perf_counter()
+    classifier.fit(X_train, y_train)
+    elapsed = time.perf_counter() - start
+    return elapsed, roc(classifier, X_test, y_test)[3]
+
+
+def main(sizes=(500, 2000, 20000, 200000), max_svc=2000):
+    print('{:>8} {:>10} {:>8} {:>10} {:>8}'.format(
+        'images', 'SVC s', 'AUC', 'linear s', 'AUC'))
+    for n in sizes:
+        X, y = make_classification(n_samples=n, n_features=350,
+                                   n_informative=40, flip_y=0.2,
+                                   random_state=1234123)
+        split = train_test_split(X, y, test_size=.3, random_state=1234123)
+        # libsvm's kernel solve grows quadratically; skip it past max_svc
+        if n <= max_svc:
+            svc = SVC(kernel='linear', probability=True, random_state=42)
+            svc_time, svc_auc = fit_and_score(svc, *split)
+            svc_cols = '{:10.2f} {:8.3f}'.format(svc_time, svc_auc)
+        else:
+            svc_cols = '{:>10} {:>8}'.format('skipped', '-')
+        linear_time, linear_auc = fit_and_score(make_linear_classifier(),
+                                                *split)
+        print('{:>8} {} {:10.2f} {:8.3f}'.format(n, svc_cols, linear_time,
+                                                 linear_auc))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Reports create_feature_matrix throughput in images/sec from 1 to N worker
+processes, plus a rerun served from the feature cache.
+
+Run from the project folder:  python -m datasets.benchmark_bee_features
+"""
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from datasets.bee_features import create_feature_matrix
+
+
+def images_per_sec(labels, **kwargs):
+    start = time.perf_counter()
+    create_feature_matrix(labels, **kwargs)
+    return len(labels) / (time.perf_counter() - start)
+
+
+def main(max_jobs=None):
+    labels = pd.read_csv("datasets/labels.csv", index_col=0)
+    max_jobs = max_jobs or os.cpu_count()
+    n_jobs = 1
+    print('{:>6} {:>12}'.format('cores', 'images/sec'))
+    while True:
+        print('{:>6} {:12.1f}'.format(n_jobs,
+                                      images_per_sec(labels, n_jobs=n_jobs)))
+        if n_jobs == max_jobs:
+            break
+        n_jobs = min(2 * n_jobs, max_jobs)
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        images_per_sec(labels, cache_dir=cache_dir)
+        cached = images_per_sec(labels, cache_dir=cache_dir)
+    finally:
+        shutil.rmtree(cache_dir)
+    print('{:>6} {:12.1f}'.format('cached', cached))
+
+
+if __name__ == '__main__':
+    main()
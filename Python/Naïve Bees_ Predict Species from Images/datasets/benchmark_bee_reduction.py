@@ -0,0 +1,42 @@
+"""
+Compares fit time and peak traced memory of the full, randomized and
+incremental StandardScaler + PCA stages on cached bee features.
+
+Run from the project folder:  python -m datasets.benchmark_bee_reduction
+"""
+import shutil
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datasets.bee_features import create_feature_matrix
+from datasets.bee_reduction import fit_reduction
+
+
+def main(n_components=350, batch_size=500):
+    labels = pd.read_csv("datasets/labels.csv", index_col=0)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        # Warm the cache so every method reads precomputed features, in
+        # float64 for the full path and float32 for the others
+        for dtype in (np.float64, np.float32):
+            create_feature_matrix(labels, cache_dir=cache_dir, dtype=dtype)
+        print('{:>12} {:>10} {:>12}'.format('method', 'fit s', 'peak MiB'))
+        for method in ('full', 'randomized', 'incremental'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            fit_reduction(labels, n_components=n_components, method=method,
+                          batch_size=batch_size, random_state=0,
+                          cache_dir=cache_dir, n_jobs=1)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('{:>12} {:10.2f} {:12.1f}'.format(method, elapsed,
+                                                    peak / 2 ** 20))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
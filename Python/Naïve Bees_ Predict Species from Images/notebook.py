@@ -208,6 +208,11 @@ def create_feature_matrix(label_dataframe):
 # run create_feature_matrix on our dataframe of images
 feature_matrix = create_feature_matrix(labels)
 
+# For large image sets, the same matrix can be built in parallel as float32,
+# with features cached per image so reruns skip the HOG computation
+# from datasets import bee_features
+# feature_matrix = bee_features.create_feature_matrix(labels, cache_dir="datasets/feature_cache")
+
 
 # In[13]:
 
@@ -309,6 +314,10 @@ get_ipython().run_cell_magic('nose', '', "   \ndef test_task9_2():\n    assert r
 
 # define support vector classifier
 svm = SVC(kernel='linear', probability=True, random_state=42)
+# for hundreds of thousands of images, use the primal linear SVM with
+# separate Platt calibration instead; predict_proba works the same way
+# from datasets.bee_classifier import make_linear_classifier
+# svm = make_linear_classifier()
 
 # fit model
 svm.fit(X_train, y_train)
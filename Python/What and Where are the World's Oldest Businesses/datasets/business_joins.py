@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+
+class CodeLookup:
+    """
+    A lookup table such as countries.csv or categories.csv, indexed once by
+    its code column.
+
+    Business codes are turned into positions in the table, so a join is a
+    take of the table's columns at those positions instead of a hash merge.
+    The other columns are kept as categoricals, whose categories are sorted
+    like the groups of a `groupby` on the plain strings.
+    """
+
+    def __init__(self, table, key):
+        self.key = key
+        self.codes = pd.Index(table[key])
+        if not self.codes.is_unique:
+            raise ValueError('{} has duplicate codes'.format(key))
+        self.columns = {column: pd.Categorical(table[column])
+                        for column in table.columns if column != key}
+
+    @classmethod
+    def from_csv(cls, path, key):
+        return cls(pd.read_csv(path), key)
+
+    def positions(self, codes):
+        """
+        The row of this table for each of `codes`, or -1 for unknown codes.
+        """
+        if isinstance(codes.dtype, pd.CategoricalDtype):
+            # Map the few categories, then take by the integer codes
+            mapping = np.append(self.codes.get_indexer(codes.cat.categories),
+                                -1)
+            return mapping[codes.cat.codes.to_numpy()]
+        return self.codes.get_indexer(codes)
+
+    def categorize(self, codes):
+        """
+        `codes` as a categorical over this table's codes, so that later
+        joins skip hashing entirely.  Unknown codes become missing.
+        """
+        return pd.Categorical.from_codes(self.positions(codes),
+                                         categories=self.codes)
+
+    def join(self, df, how='inner'):
+        """
+        `df` with this table's columns added for its `key` column, like
+        `df.merge(table, on=key, how=how)` for how='inner' or 'left'.
+
+        Rows keep their order and index; the added columns are categorical.
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError("how must be 'inner' or 'left', "
+                             "got {!r}".format(how))
+        positions = self.positions(df[self.key])
+        missing = positions < 0
+        if how == 'inner' and missing.any():
+            df = df[~missing]
+            positions = positions[~missing]
+            missing = missing[~missing]
+        added = {}
+        for column, values in self.columns.items():
+            codes = values.codes.take(positions)
+            codes[missing] = -1
+            added[column] = pd.Categorical.from_codes(
+                codes, categories=values.categories)
+        return df.assign(**added)
+
+
+def oldest_by(df, by, value='year_founded', keep='all'):
+    """
+    The rows of `df` with the smallest `value` in each group of `by`, from
+    one grouped pass instead of aggregating the minimum and merging it back.
+
+    keep='all' returns every row tied for the minimum, like the notebook's
+    aggregate-then-merge, and keep='first' only the first of them, as
+    `idxmin` does.  Groups come out in sorted order.
+    """
+    if keep not in ('all', 'first'):
+        raise ValueError("keep must be 'all' or 'first', "
+                         "got {!r}".format(keep))
+    if not df.index.is_unique:
+        df = df.reset_index(drop=True)
+    grouped = df.groupby(by, observed=True, sort=True)[value]
+    if keep == 'first':
+        return df.loc[grouped.idxmin().to_numpy()]
+    oldest = df[df[value].to_numpy() == grouped.transform('min').to_numpy()]
+    return oldest.sort_values(by, kind='stable')
+
+
+class CountryCoverage:
+    """
+    Which countries of a countries lookup have at least one business.
+
+    Replaces the notebook's outer merge with indicator=True: each batch of
+    businesses only sets flags for its own codes, so adding new_businesses
+    costs the size of the batch, and missing countries are read from the
+    flags without joining the full table again.
+    """
+
+    def __init__(self, country_lookup, businesses=None):
+        self.lookup = country_lookup
+        self.covered = np.zeros(len(country_lookup.codes), dtype=bool)
+        # Codes with businesses but no row in countries
+        self.unknown_codes = set()
+        if businesses is not None:
+            self.add(businesses)
+
+    def add(self, businesses):
+        codes = businesses[self.lookup.key]
+        positions = self.lookup.positions(codes)
+        known = positions >= 0
+        self.covered[positions[known]] = True
+        if not known.all():
+            self.unknown_codes.update(np.asarray(codes)[~known])
+
+    def missing_countries(self):
+        """
+        The names of the countries with no business, in countries order.
+        """
+        missing = ~self.covered
+        return pd.Series(np.asarray(self.lookup.columns['country'])[missing],
+                         index=np.flatnonzero(missing), name='country')
+
+    def count_missing(self):
+        """
+        The notebook's `count_missing` table: the number of countries with
+        no business on each continent that has any.
+        """
+        continents = self.lookup.columns['continent']
+        counts = np.bincount(continents.codes[~self.covered],
+                             minlength=len(continents.categories))
+        count_missing = pd.DataFrame(
+            {'count_missing': counts},
+            index=pd.Index(continents.categories, name='continent'))
+        return count_missing[count_missing['count_missing'] > 0]
@@ -178,6 +178,12 @@ merged_continent = continent.merge(businesses_countries, on=["continent", "year_
 subset_merged_continent = merged_continent[["continent", "country", "business", "year_founded"]]
 subset_merged_continent
 
+# For millions of businesses, datasets/business_joins.py joins by position
+# in an indexed countries table and finds the oldest rows in one pass:
+# from datasets.business_joins import CodeLookup, oldest_by
+# country_lookup = CodeLookup(countries, "country_code")
+# oldest_by(country_lookup.join(sorted_businesses), "continent")
+
 
 # In[99]:
 
@@ -265,6 +271,13 @@ count_missing = new_missing_countries.groupby("continent").agg({"country":"count
 count_missing.columns = ["count_missing"]
 count_missing
 
+# datasets/business_joins.py keeps the same answer up to date as batches
+# arrive, without redoing the outer merge:
+# from datasets.business_joins import CodeLookup, CountryCoverage
+# coverage = CountryCoverage(CodeLookup(countries, "country_code"), businesses)
+# coverage.add(new_businesses)
+# coverage.count_missing()
+
 
 # In[103]:
 
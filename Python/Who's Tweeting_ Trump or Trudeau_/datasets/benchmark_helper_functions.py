@@ -0,0 +1,54 @@
+"""
+Times plot_confusion_matrix at 2, 50 and 500 classes, annotating every
+cell versus only the top 100 cells and 50 tick labels on one axes reused
+across all sizes, checking that the reused image follows each new shape.
+
+Run from the project folder:  python -m datasets.benchmark_helper_functions
+"""
+import contextlib
+import io
+import time
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+import numpy as np
+from datasets.helper_functions import plot_confusion_matrix
+
+
+def time_render(cm, classes, repeat=3, **kwargs):
+    # Best of `repeat` renders including the canvas draw, in seconds
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            plot_confusion_matrix(cm, classes, **kwargs)
+        plt.gcf().canvas.draw()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes=(2, 50, 500), top_k=100, max_ticks=50, max_full=50):
+    rng = np.random.RandomState(0)
+    print('{:>8} {:>12} {:>12}'.format('classes', 'all cells', 'top-k'))
+    fig, ax = plt.subplots()
+    for n in sizes:
+        cm = rng.poisson(5, size=(n, n)) + np.diag(rng.poisson(500, size=n))
+        classes = [str(i) for i in range(n)]
+        # Annotating all 250,000 cells at 500 classes takes minutes
+        if n <= max_full:
+            full = '{:10.3f} s'.format(time_render(cm, classes, figure=n))
+        else:
+            full = 'skipped'
+        fast = time_render(cm, classes, ax=ax, top_k=top_k,
+                           max_ticks=max_ticks)
+        extent = tuple(ax.images[0].get_extent())
+        assert extent == (-0.5, n - 0.5, n - 0.5, -0.5), extent
+        print('{:>8} {:>12} {:10.3f} s'.format(n, full, fast))
+        for num in plt.get_fignums():
+            if num != fig.number:
+                plt.close(num)
+    plt.close('all')
+
+
+if __name__ == '__main__':
+    main()
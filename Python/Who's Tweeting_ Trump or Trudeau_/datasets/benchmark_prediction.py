@@ -0,0 +1,59 @@
+"""
+Measures AuthorPredictor.predict_many latency and throughput at batch
+sizes from 1 to 4096, with a cold and a warm vectorization cache.
+
+Run from the project folder:  python -m datasets.benchmark_prediction
+"""
+import time
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.svm import LinearSVC
+from datasets.prediction import AuthorPredictor
+
+
+def fit_predictor(path='datasets/tweets.csv'):
+    tweet_df = pd.read_csv(path)
+    tfidf_vectorizer = TfidfVectorizer(stop_words='english', min_df=0.05,
+                                       max_df=0.9)
+    tfidf_train = tfidf_vectorizer.fit_transform(tweet_df['status'])
+    tfidf_svc = LinearSVC().fit(tfidf_train, tweet_df['author'])
+    return AuthorPredictor(tfidf_vectorizer, tfidf_svc), tweet_df['status']
+
+
+def time_calls(predictor, batches):
+    # Latency of each predict_many call, in seconds
+    latencies = []
+    for batch in batches:
+        start = time.perf_counter()
+        predictor.predict_many(batch)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies)
+
+
+def main(batch_sizes=(1, 4, 16, 64, 256, 1024, 4096), n_calls=50):
+    predictor, statuses = fit_predictor()
+    rng = np.random.RandomState(53)
+    # Tweets with a random suffix never repeat, so every text is a miss
+    unseen = statuses.values + ' ' + rng.randint(10 ** 9,
+                                                 size=len(statuses)).astype(str)
+    print('{:>6} {:>6} {:>10} {:>10} {:>14}'.format(
+        'batch', 'cache', 'p50 ms', 'p99 ms', 'texts/s'))
+    for batch_size in batch_sizes:
+        calls = max(5, min(n_calls, 20000 // batch_size))
+        batches = [rng.choice(statuses.values, batch_size) for _ in range(calls)]
+        predictor.clear_cache()
+        cold = [rng.choice(unseen, batch_size) for _ in range(calls)]
+        for label, todo in (('cold', cold), ('warm', batches)):
+            if label == 'warm':
+                predictor.predict_many(statuses.values)
+            latencies = time_calls(predictor, todo)
+            print('{:>6} {:>6} {:10.3f} {:10.3f} {:14,.0f}'.format(
+                batch_size, label,
+                np.percentile(latencies, 50) * 1000,
+                np.percentile(latencies, 99) * 1000,
+                batch_size * calls / latencies.sum()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+from sklearn import metrics
+
+
+def vectorize(X_train, X_test, stop_words='english', min_df=0.05,
+              max_df=0.9):
+    """
+    Tokenizes the tweets once and derives both feature sets from the counts.
+
+    A TfidfVectorizer is a CountVectorizer followed by a TfidfTransformer,
+    so reweighting the count matrices gives the notebook's TF-IDF matrices
+    without tokenizing the text a second time.  The returned
+    `tfidf_vectorizer` is a fitted pipeline that vectorizes new tweets.
+    """
+    count_vectorizer = CountVectorizer(stop_words=stop_words, min_df=min_df,
+                                       max_df=max_df)
+    count_train = count_vectorizer.fit_transform(X_train)
+    count_test = count_vectorizer.transform(X_test)
+
+    tfidf_transformer = TfidfTransformer()
+    tfidf_train = tfidf_transformer.fit_transform(count_train)
+    tfidf_test = tfidf_transformer.transform(count_test)
+
+    tfidf_vectorizer = Pipeline([('count', count_vectorizer),
+                                 ('tfidf', tfidf_transformer)])
+    return {'count_vectorizer': count_vectorizer,
+            'tfidf_vectorizer': tfidf_vectorizer,
+            'count': (count_train, count_test),
+            'tfidf': (tfidf_train, tfidf_test)}
+
+
+def _fit_and_score(model, train, test, y_train, y_test):
+    start = time.perf_counter()
+    model.fit(train, y_train)
+    pred = model.predict(test)
+    return model, metrics.accuracy_score(y_test, pred), time.perf_counter() - start
+
+
+def run_experiments(X_train, X_test, y_train, y_test, n_jobs=3):
+    """
+    Runs the notebook's count_nb, tfidf_nb and tfidf_svc experiments.
+
+    The three models are fitted concurrently by `n_jobs` threads on the
+    shared feature matrices.  Returns `(results, timings)`: `results` maps
+    each model name to `(model, accuracy)` and also holds the fitted
+    vectorizers, and `timings` maps each stage to its wall time in seconds.
+    """
+    timings = {}
+    start = time.perf_counter()
+    features = vectorize(X_train, X_test)
+    timings['vectorize'] = time.perf_counter() - start
+
+    experiments = {'count_nb': (MultinomialNB(), 'count'),
+                   'tfidf_nb': (MultinomialNB(), 'tfidf'),
+                   'tfidf_svc': (LinearSVC(), 'tfidf')}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {name: executor.submit(_fit_and_score, model,
+                                         *features[kind], y_train, y_test)
+                   for name, (model, kind) in experiments.items()}
+        results = {}
+        for name, future in futures.items():
+            model, score, elapsed = future.result()
+            results[name] = (model, score)
+            timings[name] = elapsed
+    timings['fit_all'] = time.perf_counter() - start
+
+    results['count_vectorizer'] = features['count_vectorizer']
+    results['tfidf_vectorizer'] = features['tfidf_vectorizer']
+    return results, timings
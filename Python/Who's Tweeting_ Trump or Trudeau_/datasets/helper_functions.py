@@ -1,27 +1,53 @@
 from matplotlib import pyplot as plt
 import numpy as np
-import itertools
 
 
 def plot_confusion_matrix(cm, classes,
                           normalize=False,
                           title='Confusion matrix',
                           cmap=plt.cm.Blues,
-                          figure=0):
+                          figure=0,
+                          ax=None,
+                          threshold=None,
+                          top_k=None,
+                          max_ticks=None):
     """
     See full source and example:
     http://scikit-learn.org/stable/auto_examples/model_selection/plot_confusion_matrix.html
 
     This function prints and plots the confusion matrix.
     Normalization can be applied by setting `normalize=True`.
+
+    Every cell is annotated by default, which gets slow past a few dozen
+    classes.  Set `threshold` to annotate only cells with at least that
+    value and/or `top_k` to annotate only the `top_k` largest cells, and
+    `max_ticks` to label only every n-th class along the axes.
+    Pass an `ax` to redraw into it; a matrix already drawn there by this
+    function is updated in place, reusing its image and colorbar.
     """
-    plt.figure(figure)
-    plt.imshow(cm, interpolation='nearest', cmap=cmap)
-    plt.title(title)
-    plt.colorbar()
-    tick_marks = np.arange(len(classes))
-    plt.xticks(tick_marks, classes, rotation=45)
-    plt.yticks(tick_marks, classes)
+    if ax is None:
+        plt.figure(figure)
+        ax = plt.gca()
+    if ax.images:
+        im = ax.images[0]
+        im.set_data(cm)
+        # imshow fixed the extent to the first matrix drawn here
+        im.set_extent((-0.5, cm.shape[1] - 0.5, cm.shape[0] - 0.5, -0.5))
+        im.set_clim(cm.min(), cm.max())
+        for text in list(ax.texts):
+            text.remove()
+    else:
+        im = ax.imshow(cm, interpolation='nearest', cmap=cmap)
+        ax.figure.colorbar(im, ax=ax)
+    ax.set_title(title)
+    step = 1
+    if max_ticks is not None and len(classes) > max_ticks:
+        step = int(np.ceil(len(classes) / max_ticks))
+    tick_marks = np.arange(0, len(classes), step)
+    ax.set_xticks(tick_marks)
+    ax.set_xticklabels(classes[::step], rotation=45)
+    ax.set_yticks(tick_marks)
+    ax.set_yticklabels(classes[::step])
 
     if normalize:
         cm = cm.astype('float') / cm.sum(axis=1)[:, np.newaxis]
@@ -30,14 +56,26 @@ def plot_confusion_matrix(cm, classes,
         print('Confusion matrix, without normalization')
 
     thresh = cm.max() / 2.
-    for i, j in itertools.product(range(cm.shape[0]), range(cm.shape[1])):
-        plt.text(j, i, cm[i, j],
-                 horizontalalignment="center",
-                 color="white" if cm[i, j] > thresh else "black")
+    for i, j in zip(*_cells_to_annotate(cm, threshold, top_k)):
+        ax.text(j, i, cm[i, j],
+                horizontalalignment="center",
+                color="white" if cm[i, j] > thresh else "black")
+
+    ax.figure.tight_layout()
+    ax.set_ylabel('True label')
+    ax.set_xlabel('Predicted label')
 
-    plt.tight_layout()
-    plt.ylabel('True label')
-    plt.xlabel('Predicted label')
+
+def _cells_to_annotate(cm, threshold=None, top_k=None):
+    # Row and column indices of the cells plot_confusion_matrix labels
+    values = cm.ravel()
+    if threshold is None:
+        cells = np.arange(values.size)
+    else:
+        cells = np.flatnonzero(values >= threshold)
+    if top_k is not None and len(cells) > top_k:
+        cells = cells[np.argpartition(values[cells], -top_k)[-top_k:]]
+    return np.unravel_index(cells, cm.shape)
 
 
 def plot_and_return_top_features(classifier, vectorizer, top_features=20):
@@ -47,16 +85,7 @@ def plot_and_return_top_features(classifier, vectorizer, top_features=20):
     Adapted from https://medium.com/@aneesha/visualising-top-features-in-linear-svm-with-scikit-learn-and-matplotlib-3454ab18a14d
     and https://stackoverflow.com/a/26980472 by @kjam
     """
-    class_labels = classifier.classes_
-    feature_names = vectorizer.get_feature_names()
-    topn_class1 = sorted(zip(classifier.coef_[0], feature_names))[:top_features]
-    topn_class2 = sorted(zip(classifier.coef_[0], feature_names))[-top_features:]
-    top_coefficients = np.hstack([topn_class1, topn_class2])
-    if set(topn_class1).union(topn_class2):
-        top_coefficients = topn_class1
-        for ce in topn_class2:
-            if ce not in topn_class1:
-                top_coefficients.append(x)
+    top_coefficients = return_top_features(classifier, vectorizer, top_features)
 
     plt.figure(figsize=(15, 5))
     colors = ['red' if c < 0 else 'blue' for c in [tc[0] for tc in top_coefficients]]
@@ -65,3 +94,58 @@ def plot_and_return_top_features(classifier, vectorizer, top_features=20):
                [tc[1] for tc in top_coefficients], rotation=60, ha='right')
     plt.show()
     return top_coefficients
+
+
+def return_top_features(classifier, vectorizer, top_features=20):
+    """
+    Return the top features in a binary classification model without plotting.
+
+    The result is the list of `(coef, name)` tuples plotted by
+    `plot_and_return_top_features`: the `top_features` lowest coefficients,
+    then the `top_features` highest ones not already listed, each in
+    ascending order.
+    """
+    return return_top_features_many([classifier], vectorizer, top_features)[0]
+
+
+def return_top_features_many(classifiers, vectorizer, top_features=20):
+    """
+    Return the top features of several binary classifiers fitted on the same
+    vectorizer, looking up the vocabulary only once.
+    """
+    # get_feature_names was removed in scikit-learn 1.2
+    if hasattr(vectorizer, 'get_feature_names_out'):
+        feature_names = vectorizer.get_feature_names_out()
+    else:
+        feature_names = vectorizer.get_feature_names()
+    feature_names = np.asarray(feature_names, dtype=object)
+    return [_top_coefficients(classifier.coef_, feature_names, top_features)
+            for classifier in classifiers]
+
+
+def _top_coefficients(coef, feature_names, top_features):
+    # Partitioning finds the extremes in linear time, so only about
+    # 2 * top_features coefficients are ever sorted
+    if hasattr(coef, 'toarray'):
+        coef = coef[0].toarray().ravel()
+    else:
+        coef = np.asarray(coef[0])
+    n = len(coef)
+
+    def in_order(idx):
+        # Sort like sorted(zip(coef, names)): by coefficient, then name
+        return idx[np.lexsort((feature_names[idx], coef[idx]))]
+
+    if top_features >= n:
+        lowest = highest = in_order(np.arange(n))
+    else:
+        # Widen each selection to every coefficient tied with its boundary
+        # so ties are broken by name, exactly as a full sort would
+        kth = np.partition(coef, [top_features - 1, n - top_features])
+        lowest = in_order(np.flatnonzero(coef <= kth[top_features - 1]))
+        lowest = lowest[:top_features]
+        highest = in_order(np.flatnonzero(coef >= kth[n - top_features]))
+        highest = highest[-top_features:]
+
+    highest = highest[~np.isin(highest, lowest)]
+    return [(coef[i], feature_names[i]) for i in np.concatenate([lowest, highest])]
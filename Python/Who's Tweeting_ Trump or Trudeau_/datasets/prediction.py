@@ -0,0 +1,71 @@
+import pickle
+from collections import OrderedDict
+import numpy as np
+import scipy.sparse as sp
+
+
+class AuthorPredictor:
+    """
+    A fitted vectorizer and classifier served together.
+
+    `predict_many` vectorizes texts in batches of `batch_size` and keeps the
+    vectors of the last `cache_size` distinct texts, so repeated inputs skip
+    tokenization entirely.
+    """
+
+    def __init__(self, vectorizer, classifier, batch_size=512,
+                 cache_size=10000):
+        self.vectorizer = vectorizer
+        self.classifier = classifier
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def save(self, path):
+        # The cache is rebuilt on demand and never written to disk
+        with open(path, 'wb') as f:
+            pickle.dump((self.vectorizer, self.classifier), f)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with open(path, 'rb') as f:
+            vectorizer, classifier = pickle.load(f)
+        return cls(vectorizer, classifier, **kwargs)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def predict(self, text):
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts):
+        """
+        Predicts the author of every string in `texts`, in order.
+        """
+        if not len(texts):
+            return self.classifier.classes_[:0]
+        return self.classifier.predict(self.transform(texts))
+
+    def transform(self, texts):
+        # Duplicates in one call are vectorized once, as are cache hits
+        unique, inverse = np.unique(np.asarray(texts, dtype=object),
+                                    return_inverse=True)
+        rows = []
+        for text in unique:
+            row = self._cache.get(text)
+            if row is not None:
+                self._cache.move_to_end(text)
+            rows.append(row)
+        misses = [i for i, row in enumerate(rows) if row is None]
+        for start in range(0, len(misses), self.batch_size):
+            batch = misses[start:start + self.batch_size]
+            vectors = self.vectorizer.transform([unique[i] for i in batch])
+            for i, row in zip(batch, vectors):
+                rows[i] = row
+                self._remember(unique[i], row)
+        return sp.vstack(rows, format='csr')[inverse.ravel()]
+
+    def _remember(self, text, row):
+        self._cache[text] = row
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
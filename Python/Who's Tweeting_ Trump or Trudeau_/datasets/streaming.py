@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn import metrics
+
+AUTHORS = ['Donald J. Trump', 'Justin Trudeau']
+
+
+def make_vectorizers(n_features=2 ** 18):
+    """
+    Stateless stand-ins for the notebook's CountVectorizer and
+    TfidfVectorizer: raw hashed counts and L2-normalized hashed counts.
+
+    Hashing needs no vocabulary, so `min_df`/`max_df` cannot be applied.
+    `alternate_sign=False` keeps the features non-negative for MultinomialNB.
+    """
+    count = HashingVectorizer(stop_words='english', n_features=n_features,
+                              alternate_sign=False, norm=None)
+    tfidf = HashingVectorizer(stop_words='english', n_features=n_features,
+                              alternate_sign=False, norm='l2')
+    return {'count': count, 'tfidf': tfidf}
+
+
+def make_models(random_state=53):
+    """
+    The notebook's three models with `partial_fit`.  A hinge-loss
+    SGDClassifier is the incremental counterpart of LinearSVC.
+    """
+    return {'count_nb': ('count', MultinomialNB()),
+            'tfidf_nb': ('tfidf', MultinomialNB()),
+            'tfidf_svc': ('tfidf', SGDClassifier(loss='hinge',
+                                                 random_state=random_state))}
+
+
+def _chunks(path, chunksize, test_size, random_state):
+    # Yields (chunk, is_test) with the same rows held out on every pass
+    rng = np.random.RandomState(random_state)
+    for chunk in pd.read_csv(path, usecols=['status', 'author'],
+                             chunksize=chunksize):
+        chunk = chunk.dropna()
+        yield chunk, rng.uniform(size=len(chunk)) < test_size
+
+
+def train_streaming(path='datasets/tweets.csv', chunksize=10000,
+                    test_size=0.33, random_state=53, n_features=2 ** 18,
+                    n_epochs=5, classes=AUTHORS):
+    """
+    Trains the author classifiers on `path` one chunk at a time.
+
+    `n_epochs` passes fit every model with `partial_fit` on the training rows
+    of each chunk, and a final pass scores the held-out rows, so memory
+    depends on `chunksize` and `n_features` but not on the size of the file.
+    Returns a dict mapping model name to `(model, accuracy)`.
+    """
+    vectorizers = make_vectorizers(n_features)
+    models = make_models(random_state)
+
+    for epoch in range(n_epochs):
+        for chunk, is_test in _chunks(path, chunksize, test_size,
+                                      random_state):
+            train = chunk[~is_test]
+            if train.empty:
+                continue
+            features = {name: vectorizer.transform(train['status'])
+                        for name, vectorizer in vectorizers.items()}
+            for features_name, model in models.values():
+                # Naive Bayes only counts, so a second pass just doubles them
+                if epoch and isinstance(model, MultinomialNB):
+                    continue
+                model.partial_fit(features[features_name], train['author'],
+                                  classes=classes)
+
+    correct = dict.fromkeys(models, 0)
+    total = 0
+    for chunk, is_test in _chunks(path, chunksize, test_size, random_state):
+        test = chunk[is_test]
+        if test.empty:
+            continue
+        features = {name: vectorizer.transform(test['status'])
+                    for name, vectorizer in vectorizers.items()}
+        for name, (features_name, model) in models.items():
+            pred = model.predict(features[features_name])
+            correct[name] += metrics.accuracy_score(test['author'], pred,
+                                                    normalize=False)
+        total += len(test)
+
+    return {name: (model, correct[name] / total if total else float('nan'))
+            for name, (_, model) in models.items()}
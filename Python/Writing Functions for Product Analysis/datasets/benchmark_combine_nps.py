@@ -0,0 +1,101 @@
+"""
+Times combining many NPS CSVs with the notebook's check-then-convert loop
+and with `combine_nps_csvs` from datasets/nps.py, on copies of the Q4
+files written to a temporary folder, and checks both give the same rows.
+
+Run from the project folder:  python -m datasets.benchmark_combine_nps
+"""
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from datasets.benchmark_nps import categorize_nps
+from datasets.nps import combine_nps_csvs
+
+SOURCES = {'datasets/2020Q4_nps_email.csv': 'email',
+           'datasets/2020Q4_nps_web.csv': 'web',
+           'datasets/2020Q4_nps_mobile.csv': 'mobile'}
+
+
+def check_csv(csv_name):
+    with open(csv_name) as f:
+        return f.readline() == "response_date,user_id,nps_rating\n"
+
+
+def convert_csv_to_df(csv_name, source_type):
+    df = pd.read_csv(csv_name)
+    df['source'] = source_type
+    df['nps_group'] = df['nps_rating'].apply(categorize_nps)
+    return df
+
+
+def combine_nps_csvs_loop(csvs_dict):
+    # The notebook's version: two opens per file and a concat per file
+    combined = pd.DataFrame()
+    for csv_name, source_type in csvs_dict.items():
+        if check_csv(csv_name):
+            temp = convert_csv_to_df(csv_name, source_type)
+            combined = pd.concat([combined, temp])
+        else:
+            print(source_type + " is not a valid file and will not be added.")
+    return combined
+
+
+def make_files(folder, n_files, corrupted_every=50, gaps_every=25):
+    # Copies the Q4 files round-robin, with a corrupted file now and then
+    # and some valid files ending in a blank and a fractional rating
+    csvs_dict = {}
+    sources = list(SOURCES.items())
+    for i in range(n_files):
+        if corrupted_every and i % corrupted_every == corrupted_every - 1:
+            src, source_type = 'datasets/corrupted.csv', 'corrupted'
+        else:
+            src, source_type = sources[i % len(sources)]
+        dst = os.path.join(folder, '{:04d}_{}'.format(
+            i, os.path.basename(src)))
+        shutil.copyfile(src, dst)
+        if (source_type != 'corrupted' and gaps_every
+                and i % gaps_every == 0):
+            with open(dst, 'a') as f:
+                f.write('2020-12-31,2,\n2020-12-31,3,7.5\n')
+        csvs_dict[dst] = source_type
+    return csvs_dict
+
+
+def main(n_files=500, n_jobs=8):
+    folder = tempfile.mkdtemp()
+    try:
+        csvs_dict = make_files(folder, n_files)
+        timings = {}
+        results = {}
+        for name, combine in (('loop', combine_nps_csvs_loop),
+                              ('combine_nps_csvs',
+                               lambda d: combine_nps_csvs(d, n_jobs=n_jobs))):
+            # The invalid-file messages are part of both versions' output
+            with contextlib.redirect_stdout(io.StringIO()) as messages:
+                start = time.perf_counter()
+                results[name] = combine(csvs_dict)
+                timings[name] = time.perf_counter() - start
+            n_invalid = messages.getvalue().count('is not a valid file')
+    finally:
+        shutil.rmtree(folder)
+
+    loop, fast = results['loop'], results['combine_nps_csvs']
+    # The loop infers int64 ids where combine_nps_csvs reads nullable ones
+    pd.testing.assert_frame_equal(loop.drop(columns='nps_group'),
+                                  fast.drop(columns='nps_group'),
+                                  check_dtype=False)
+    assert (loop['nps_group'] == fast['nps_group'].astype(str)).all()
+    print('{} files ({} invalid), {} rows'.format(
+        n_files, n_invalid, len(fast)))
+    for name, seconds in timings.items():
+        print('{:>18} {:8.3f} s'.format(name, seconds))
+    print('{:>18} {:8.1f}x'.format(
+        'speedup', timings['loop'] / timings['combine_nps_csvs']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Times categorizing and scoring synthetic NPS responses with the notebook's
+row-by-row `apply` and with the vectorized helpers in datasets/nps.py, and
+checks that both give the same scores.
+
+Run from the project folder:  python -m datasets.benchmark_nps
+"""
+import time
+import numpy as np
+import pandas as pd
+from datasets.nps import calculate_nps_by_source, categorize_nps_series
+
+
+def categorize_nps(x):
+    # The notebook's scalar version
+    if x == 9 or x == 10:
+        return 'promoter'
+    elif x == 7 or x == 8:
+        return 'passive'
+    elif x >= 0 and x <= 6:
+        return 'detractor'
+    else:
+        return 'invalid'
+
+
+def calculate_nps(nps_df):
+    counts = nps_df['nps_group'].value_counts()
+    return (counts['promoter'] - counts['detractor']) / counts.sum() * 100
+
+
+def make_responses(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'nps_rating': rng.integers(-1, 12, size=n),
+        'source': pd.Categorical(rng.choice(['email', 'mobile', 'web'],
+                                            size=n))})
+
+
+def main(sizes=(100000, 1000000, 10000000)):
+    print('{:>10} {:>12} {:>12} {:>9}'.format(
+        'responses', 'apply s', 'vector s', 'speedup'))
+    for n in sizes:
+        df = make_responses(n)
+
+        start = time.perf_counter()
+        vectorized = df.assign(nps_group=categorize_nps_series(df['nps_rating']))
+        fast = calculate_nps_by_source(vectorized)
+        fast_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scalar = df.assign(nps_group=df['nps_rating'].apply(categorize_nps))
+        slow = scalar.groupby('source', observed=True).apply(calculate_nps)
+        slow_seconds = time.perf_counter() - start
+
+        assert (vectorized['nps_group'].astype(str)
+                == scalar['nps_group']).all()
+        assert np.array_equal(fast.to_numpy(), slow.to_numpy())
+        print('{:>10} {:12.3f} {:12.3f} {:8.1f}x'.format(
+            n, slow_seconds, fast_seconds, slow_seconds / fast_seconds))
+
+
+if __name__ == '__main__':
+    main()
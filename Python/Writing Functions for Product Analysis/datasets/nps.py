@@ -0,0 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+NPS_GROUPS = ['detractor', 'passive', 'promoter', 'invalid']
+NPS_COLUMNS = ['response_date', 'user_id', 'nps_rating']
+NPS_HEADER = ','.join(NPS_COLUMNS) + '\n'
+# Float ratings and nullable ids, so blank or fractional ratings still
+# parse and are categorized as invalid, as in the notebook
+NPS_DTYPES = {'response_date': 'str', 'user_id': 'Int64',
+              'nps_rating': 'float64'}
+
+
+def categorize_nps_series(ratings):
+    """ Categorizes a whole column of NPS ratings at once.
+
+    Gives the same group as `categorize_nps` for every rating, including
+    "invalid" for ratings outside 0-10, fractional ratings other than 0-6
+    and missing values, but as a categorical built with one `np.select`.
+
+    Args:
+        ratings (pandas.Series): The NPS ratings.
+
+    Returns:
+        pandas.Series: A categorical with the categories in NPS_GROUPS.
+    """
+    values = ratings.to_numpy()
+    codes = np.select([(values == 9) | (values == 10),
+                       (values == 7) | (values == 8),
+                       (values >= 0) & (values <= 6)],
+                      [2, 1, 0], default=3)
+    groups = pd.Categorical.from_codes(codes, categories=NPS_GROUPS)
+    return pd.Series(groups, index=ratings.index, name='nps_group')
+
+
+def convert_csv_to_df(csv_name, source_type):
+    """ Convert an NPS CSV into a DataFrame with columns for the source and NPS group.
+
+    Like the notebook's version, but `nps_group` is filled by
+    `categorize_nps_series` instead of a row-by-row `apply`.
+
+    Args:
+        csv_name (str): The name of the NPS CSV file.
+        source_type (str): The source of the NPS responses.
+
+    Returns:
+         A DataFrame with the CSV data and columns: source and nps_group.
+    """
+    df = pd.read_csv(csv_name)
+    df['source'] = source_type
+    df['nps_group'] = categorize_nps_series(df['nps_rating'])
+    return df
+
+
+def read_nps_csv(csv_name, source_type):
+    """ Validates and converts an NPS CSV from a single open file.
+
+    The header line is checked like `check_csv` does, and the rest of the
+    same handle is parsed with fixed column types, so each file is opened
+    and scanned once.
+
+    Args:
+        csv_name (str): The name of the NPS CSV file.
+        source_type (str): The source of the NPS responses.
+
+    Returns:
+        The rows `convert_csv_to_df` would return, with float ratings and
+        nullable user ids, or None if the CSV does not have the three NPS
+        columns.
+    """
+    with open(csv_name) as f:
+        if f.readline() != NPS_HEADER:
+            return None
+        df = pd.read_csv(f, header=None, names=NPS_COLUMNS,
+                         usecols=NPS_COLUMNS, dtype=NPS_DTYPES)
+    df['source'] = source_type
+    df['nps_group'] = categorize_nps_series(df['nps_rating'])
+    return df
+
+
+def combine_nps_csvs(csvs_dict, n_jobs=8):
+    """ Converts the valid CSVs in a dictionary and combines them.
+
+    Files are read by `n_jobs` threads with `read_nps_csv` and concatenated
+    once at the end, in the order of `csvs_dict`.  Invalid files are
+    reported like in the notebook and left out.
+
+    Args:
+        csvs_dict (dict): The names of the CSV files mapped to their sources.
+        n_jobs (int): The number of files read at the same time.
+
+    Returns:
+        pandas.DataFrame: The rows of every valid CSV.
+    """
+    items = list(csvs_dict.items())
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        frames = list(executor.map(lambda item: read_nps_csv(*item), items))
+    valid = []
+    for (_, source_type), df in zip(items, frames):
+        if df is None:
+            print(source_type + " is not a valid file and will not be added.")
+        else:
+            valid.append(df)
+    if not valid:
+        return pd.DataFrame()
+    return pd.concat(valid)
+
+
+def calculate_nps(nps_df):
+    """Calculates the NPS score of a Pandas DataFrame.
+
+    Args:
+        nps_df (pandas.DataFrame): The DataFrame to calculate the NPS score on.
+
+    Returns:
+        float: The NPS score as a percentage.
+    """
+    counts = nps_df['nps_group'].value_counts()
+    detractor = counts.get('detractor', 0)
+    promoter = counts.get('promoter', 0)
+    total = counts.sum()
+    return float((promoter - detractor) / total * 100)
+
+
+def calculate_nps_by_source(nps_df):
+    """Calculates the NPS score for each source type in a Pandas DataFrame.
+
+    All sources are scored from a single grouped count of responses per
+    source and NPS group instead of one `value_counts` per group.
+
+    Args:
+        nps_df (pandas.DataFrame): The DataFrame to calculate NPS scores on.
+
+    Returns:
+        pandas.Series: A series of NPS scores broken down by source type.
+    """
+    counts = nps_df.groupby(['source', 'nps_group'], observed=True).size()
+    return nps_from_counts(counts.unstack(fill_value=0))
+
+
+def nps_from_counts(counts):
+    """Calculates NPS scores from a table of response counts.
+
+    Args:
+        counts (pandas.DataFrame): The number of responses in each NPS group,
+            with one column per group and one row per source.
+
+    Returns:
+        pandas.Series: The NPS score of each row.
+    """
+    counts = counts.reindex(columns=NPS_GROUPS, fill_value=0)
+    nps = (counts['promoter'] - counts['detractor']) / counts.sum(axis=1) * 100
+    nps.name = None
+    nps.index.name = 'source'
+    return nps
@@ -0,0 +1,141 @@
+import os
+import numpy as np
+import pandas as pd
+from datasets.nps import (NPS_GROUPS, categorize_nps_series, nps_from_counts,
+                          read_nps_csv)
+
+
+class NPSStore:
+    """ Running NPS group counts per source and response date bucket.
+
+    Batches of responses are reduced to counts as they arrive, so scores
+    never need the responses themselves again.  Scores match
+    `calculate_nps` and `calculate_nps_by_source` on all the responses
+    added so far, including "invalid" ratings in the totals.
+
+    Args:
+        freq (str): The pandas period alias response dates are bucketed by,
+            e.g. 'D' for days or 'W' for weeks.
+    """
+
+    def __init__(self, freq='D'):
+        self.freq = freq
+        index = pd.MultiIndex.from_arrays(
+            [pd.Index([], dtype=object), pd.DatetimeIndex([])],
+            names=['source', 'bucket'])
+        self.counts = pd.DataFrame(0, index=index, columns=NPS_GROUPS)
+        self.source_counts = self.counts.groupby(level='source').sum()
+
+    def add_responses(self, nps_df):
+        """ Adds a batch of responses to the counts.
+
+        Args:
+            nps_df (pandas.DataFrame): Responses with response_date, source
+                and either nps_group or nps_rating columns.
+        """
+        if 'nps_group' in nps_df:
+            groups = nps_df['nps_group']
+        else:
+            groups = categorize_nps_series(nps_df['nps_rating'])
+        buckets = pd.to_datetime(nps_df['response_date']).dt.to_period(
+            self.freq).dt.start_time
+        batch = (pd.DataFrame({'source': nps_df['source'].to_numpy(),
+                               'bucket': buckets.to_numpy(),
+                               'nps_group': groups.to_numpy()})
+                 .groupby(['source', 'bucket', 'nps_group'], observed=True)
+                 .size().unstack(fill_value=0)
+                 .reindex(columns=NPS_GROUPS, fill_value=0))
+        self.counts = self.counts.add(batch, fill_value=0).astype('int64')
+        self.source_counts = self.source_counts.add(
+            batch.groupby(level='source').sum(), fill_value=0).astype('int64')
+
+    def add_csv(self, csv_name, source_type):
+        """ Adds the responses of an NPS CSV if it is valid.
+
+        Args:
+            csv_name (str): The name of the NPS CSV file.
+            source_type (str): The source of the NPS responses.
+
+        Returns:
+            Boolean: True if the CSV was added, False if it was not valid.
+        """
+        df = read_nps_csv(csv_name, source_type)
+        if df is None:
+            print(source_type + " is not a valid file and will not be added.")
+            return False
+        self.add_responses(df)
+        return True
+
+    def _counts_between(self, start, end):
+        if start is None and end is None:
+            return self.source_counts
+        buckets = self.counts.index.get_level_values('bucket')
+        mask = np.ones(len(buckets), dtype=bool)
+        if start is not None:
+            mask &= buckets >= pd.Timestamp(start)
+        if end is not None:
+            mask &= buckets <= pd.Timestamp(end)
+        return self.counts[mask].groupby(level='source').sum()
+
+    def nps_by_source(self, start=None, end=None):
+        """ Calculates the NPS score of each source.
+
+        Without dates this reads one row of counts per source.  With dates,
+        only the buckets starting between `start` and `end` (inclusive) are
+        counted.
+
+        Args:
+            start: The first bucket to include, or None.
+            end: The last bucket to include, or None.
+
+        Returns:
+            pandas.Series: A series of NPS scores broken down by source type.
+        """
+        return nps_from_counts(self._counts_between(start, end))
+
+    def nps(self, source=None, start=None, end=None):
+        """ Calculates the NPS score of one source or of all of them.
+
+        Args:
+            source (str): The source to score, or None for all responses.
+            start: The first bucket to include, or None.
+            end: The last bucket to include, or None.
+
+        Returns:
+            float: The NPS score as a percentage.
+        """
+        counts = self._counts_between(start, end)
+        if source is not None:
+            counts = counts.loc[[source]]
+        totals = counts.sum()
+        return float((totals['promoter'] - totals['detractor'])
+                     / totals.sum() * 100)
+
+    def save(self, path):
+        """ Writes the counts to a compressed .npz file at `path`.
+
+        The file is written next to `path` and moved into place, so readers
+        polling it never see a partial file.
+        """
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f, freq=np.array(self.freq),
+                sources=self.counts.index.get_level_values(
+                    'source').to_numpy(dtype=str),
+                buckets=self.counts.index.get_level_values(
+                    'bucket').to_numpy(dtype='datetime64[ns]'),
+                counts=self.counts.to_numpy(dtype=np.int64))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            store = cls(freq=str(data['freq']))
+            index = pd.MultiIndex.from_arrays(
+                [data['sources'].astype(object), data['buckets']],
+                names=['source', 'bucket'])
+            store.counts = pd.DataFrame(data['counts'], index=index,
+                                        columns=NPS_GROUPS)
+        store.source_counts = store.counts.groupby(level='source').sum()
+        return store
@@ -166,6 +166,11 @@ my_files = {
 # Test the function on the my_files dictionary
 combine_nps_csvs(my_files)
 
+# With hundreds of files, datasets/nps.py reads each file once, several at
+# a time, and concatenates once at the end:
+# from datasets import nps
+# nps.combine_nps_csvs(my_files)
+
 
 # In[7]:
 
@@ -318,6 +323,12 @@ my_files = {
 q4_nps = combine_nps_csvs(my_files)
 calculate_nps_by_source(q4_nps)
 
+# For millions of responses, datasets/nps.py categorizes the ratings with
+# one np.select and scores every source from a single grouped count:
+# from datasets import nps
+# nps.calculate_nps_by_source(q4_nps.assign(
+#     nps_group=nps.categorize_nps_series(q4_nps['nps_rating'])))
+
 
 # In[15]:
 